@@ -9,9 +9,42 @@ Internal use only - Runs on Medtronic secure network with internal LLM
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import hashlib
 from datetime import datetime
-import io
-import random
+from typing import NamedTuple
+
+LOGO_PATH = "assets/images.png"
+
+# Internal-use badge shown under the logo, shipped as a single element
+INTERNAL_BADGE_HTML = (
+    '<h3 style="margin:0">🔒 Internal Use Only</h3>'
+    '<small style="opacity:0.6">Medtronic • Secure Network • Internal LLM</small>'
+)
+
+# Workspace tab labels and the document types offered for upload
+WORKSPACE_TABS = (
+    "📁 Ingestion & Revision",
+    "✅ Checklist & Gaps",
+    "📏 FAIR Review",
+    "⚙️ OQ Review",
+    "📊 PQ Review",
+    "📄 Reports",
+    "💬 PPAP Coaching Chat"
+)
+UPLOAD_DOC_TYPES = ("FAIR", "OQ", "PQ", "Drawing (Ballooned)", "Measurements (Excel/Minitab)")
+CHECKLIST_STATUSES = ('Satisfied', 'Missing')
+
+# Newest versions listed per document type until "Show all" is switched on
+RECENT_VERSIONS = 5
+
+# Chat messages rendered per window ("Load earlier" doubles it) and kept per chat
+CHAT_VISIBLE_MESSAGES = 30
+CHAT_HISTORY_LIMIT = 500
+
+# Entries kept per case-keyed cache, shared by all sessions; least recently
+# used entries are evicted first so the process can't grow without bound
+CASE_CACHE_ENTRIES = 256
 
 # Page configuration
 st.set_page_config(
@@ -25,43 +58,50 @@ st.set_page_config(
 # SESSION STATE INITIALIZATION
 # ============================================================================
 
-def init_session_state():
-    """Initialize all session state variables"""
+def new_survey_responses():
+    """Fresh, unanswered survey responses"""
+    return {
+        'q1_molding_surgical': None,
+        'q2_new_product': None,
+        'q3_process_verified': None,
+        'q4_fixed_setpoints': None
+    }
 
-    # Page navigation
-    if "page" not in st.session_state:
-        st.session_state.page = "SURVEY_WELCOME"  # SURVEY_WELCOME, SURVEY_Q1-Q4, SURVEY_RESULT, CASE_SETUP, PPAP_WORKSPACE
+# Session state defaults - callables are factories for mutable values so each
+# session gets its own object
+SESSION_DEFAULTS = {
+    # Page navigation: SURVEY_WELCOME, SURVEY_Q1-Q4, SURVEY_RESULT, CASE_SETUP, PPAP_WORKSPACE
+    'page': "SURVEY_WELCOME",
 
     # Survey state
-    if 'survey_responses' not in st.session_state:
-        st.session_state.survey_responses = {
-            'q1_molding_surgical': None,
-            'q2_new_product': None,
-            'q3_process_verified': None,
-            'q4_fixed_setpoints': None
-        }
-
-    if 'survey_eligible' not in st.session_state:
-        st.session_state.survey_eligible = None
-
-    if 'survey_completion_date' not in st.session_state:
-        st.session_state.survey_completion_date = None
+    'survey_responses': new_survey_responses,
+    'survey_eligible': None,
+    'survey_completion_date': None,
 
     # PPAP case state
-    if 'ppap_cases' not in st.session_state:
-        st.session_state.ppap_cases = {}
+    'ppap_cases': dict,
+    'current_case_id': None,
+    'activity_log': dict,
+    'chat_history': dict,
+    'active_chat_context': None,
+}
+
+SURVEY_PAGES = frozenset({
+    "SURVEY_WELCOME", "SURVEY_Q1", "SURVEY_Q2", "SURVEY_Q3", "SURVEY_Q4", "SURVEY_RESULT"
+})
+
+# Progress bar value and caption per question page
+SURVEY_PROGRESS = {
+    "SURVEY_Q1": (0.25, "Question 1 of 4"),
+    "SURVEY_Q2": (0.50, "Question 2 of 4"),
+    "SURVEY_Q3": (0.75, "Question 3 of 4"),
+    "SURVEY_Q4": (1.0, "Question 4 of 4"),
+}
 
-    if 'current_case_id' not in st.session_state:
-        st.session_state.current_case_id = None
-
-    if 'activity_log' not in st.session_state:
-        st.session_state.activity_log = {}
-
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = {}
-
-    if "active_chat_context" not in st.session_state:
-        st.session_state.active_chat_context = None
+def init_session_state():
+    """Initialize all session state variables"""
+    for key, default in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, default() if callable(default) else default)
 
 # ============================================================================
 # SURVEY FUNCTIONS
@@ -70,77 +110,297 @@ def init_session_state():
 def reset_survey():
     """Reset survey to start over"""
     st.session_state.page = "SURVEY_WELCOME"
-    st.session_state.survey_responses = {
-        'q1_molding_surgical': None,
-        'q2_new_product': None,
-        'q3_process_verified': None,
-        'q4_fixed_setpoints': None
-    }
+    st.session_state.survey_responses = new_survey_responses()
     st.session_state.survey_eligible = None
     st.session_state.survey_completion_date = None
 
+def go_to_page(page):
+    """Navigate to a page, rerunning only if the page actually changes"""
+    if st.session_state.page != page:
+        st.session_state.page = page
+        st.rerun()
+
+def set_page(page):
+    """Button callback - switch pages before the next run renders anything"""
+    st.session_state.page = page
+
+def ensure_page(page):
+    """Escalate a fragment rerun to a full one if a callback switched pages
+
+    Page changes always need the app scope: the next page is drawn outside
+    the fragment that triggered the change.
+    """
+    if st.session_state.page != page:
+        st.rerun(scope="app")
+
+def record_answer(question_key, answer, next_page):
+    """Store a survey answer and move on, skipping the rerun if nothing changed"""
+    responses = st.session_state.survey_responses
+    if responses[question_key] != answer or st.session_state.page != next_page:
+        responses[question_key] = answer
+        st.session_state.page = next_page
+        st.rerun()
+
 def check_eligibility():
     """Check if user is eligible based on survey responses"""
     responses = st.session_state.survey_responses
 
-    # If Q1 or Q2 is No -> Not eligible
-    if responses['q1_molding_surgical'] == 'No' or responses['q2_new_product'] == 'No':
-        return False
-
-    # If Q4 is Yes -> Not eligible
-    if responses['q4_fixed_setpoints'] == 'Yes':
-        return False
+    # Not eligible if Q1 or Q2 is No, or Q4 is Yes
+    return not (
+        responses['q1_molding_surgical'] == 'No'
+        or responses['q2_new_product'] == 'No'
+        or responses['q4_fixed_setpoints'] == 'Yes'
+    )
+
+# Ineligibility explanations, keyed by survey question
+INELIGIBILITY_REASONS = {
+    'q1_molding_surgical': {
+        'question': 'PPAP Process Type',
+        'response': 'Not molding plastic processes under Surgical Operation Unit',
+        'explanation': 'This system is specifically designed for PPAPs associated with **injection-molded plastic parts** within the **Surgical Operation Unit**. Other processes or business units are not currently supported by this tool.'
+    },
+    'q2_new_product': {
+        'question': 'Product Type',
+        'response': 'Not a new product part',
+        'explanation': 'This system currently focuses on **new product parts only**. Legacy products may have different PPAP requirements and workflows. For legacy products, we would need to check for previously approved PPAP tickets and potentially combine documentation, which requires a different review process.'
+    },
+    'q4_fixed_setpoints': {
+        'question': 'Process Parameters',
+        'response': 'Process will be run at fixed set points without parameter ranges',
+        'explanation': 'Manufacturing processes should have defined **parameter ranges** rather than single fixed setpoints. Parameter ranges allow for normal process variation while maintaining quality. Fixed setpoints without ranges indicate insufficient process understanding or validation, which does not meet PPAP requirements for robust manufacturing processes.'
+    }
+}
 
-    # Otherwise eligible
-    return True
+# (question, disqualifying answer) in display order
+INELIGIBLE_ANSWERS = (
+    ('q1_molding_surgical', 'No'),
+    ('q2_new_product', 'No'),
+    ('q4_fixed_setpoints', 'Yes')
+)
 
 def get_ineligibility_reason():
     """Get reason for ineligibility with explanation"""
     responses = st.session_state.survey_responses
 
-    reasons = []
+    return [
+        INELIGIBILITY_REASONS[question]
+        for question, answer in INELIGIBLE_ANSWERS
+        if responses[question] == answer
+    ]
 
-    if responses['q1_molding_surgical'] == 'No':
-        reasons.append({
-            'question': 'PPAP Process Type',
-            'response': 'Not molding plastic processes under Surgical Operation Unit',
-            'explanation': 'This system is specifically designed for PPAPs associated with **injection-molded plastic parts** within the **Surgical Operation Unit**. Other processes or business units are not currently supported by this tool.'
-        })
+# ============================================================================
+# SURVEY CONTENT
+# ============================================================================
 
-    if responses['q2_new_product'] == 'No':
-        reasons.append({
-            'question': 'Product Type',
-            'response': 'Not a new product part',
-            'explanation': 'This system currently focuses on **new product parts only**. Legacy products may have different PPAP requirements and workflows. For legacy products, we would need to check for previously approved PPAP tickets and potentially combine documentation, which requires a different review process.'
-        })
+WELCOME_MD = """
+## Welcome to the PPAP Review System
 
-    if responses['q4_fixed_setpoints'] == 'Yes':
-        reasons.append({
-            'question': 'Process Parameters',
-            'response': 'Process will be run at fixed set points without parameter ranges',
-            'explanation': 'Manufacturing processes should have defined **parameter ranges** rather than single fixed setpoints. Parameter ranges allow for normal process variation while maintaining quality. Fixed setpoints without ranges indicate insufficient process understanding or validation, which does not meet PPAP requirements for robust manufacturing processes.'
-        })
+This tool automates the review of PPAP (Production Part Approval Process) documentation
+for **injection-molded plastic parts** within the **Surgical Operation Unit**.
 
-    return reasons
+Before creating a PPAP case, please complete a brief eligibility survey to ensure
+this system is appropriate for your specific PPAP requirements.
+
+### What You'll Need to Know:
+- Process type and business unit
+- Product classification (new vs. legacy)
+- Process verification status
+- Process parameter specifications
+
+The survey takes approximately **1-2 minutes** to complete.
+
+---
+"""
+
+Q1_HEADER_MD = """
+---
+
+## Question 1: Process Type and Business Unit
+
+Is this PPAP associated with **molding plastic processes** under the **Surgical Operation Unit**?
+"""
+
+Q1_INFO_MD = """
+**What this means:**
+- **Molding plastic processes:** Injection molding or similar plastic manufacturing processes
+- **Surgical Operation Unit:** Business unit responsible for surgical devices and components
+
+This system is specifically designed for plastic molding processes within the Surgical Operation Unit.
+"""
+
+Q2_HEADER_MD = """
+---
+
+## Question 2: Product Classification
+
+Is this PPAP associated with a **new product part**?
+"""
+
+Q2_INFO_MD = """
+**What this means:**
+- **New product part:** A part that has not been previously manufactured or approved
+- **Not a new product part:** Legacy products, existing parts with revisions, or previously approved parts
+
+This system currently supports new product parts only. Legacy products require different workflows
+(such as checking for previously approved PPAP tickets and combining documentation).
+"""
+
+Q3_HEADER_MD = """
+---
+
+## Question 3: Process Verification Status
+
+Is the **process output fully verified**?
+"""
+
+Q3_INFO_MD = """
+**What this means:**
+- **Fully verified:** The manufacturing process has been validated and produces consistent,
+  specification-compliant parts
+- Process capability studies (Cpk) have been completed
+- First article inspection has been performed
+- Production runs demonstrate consistent output
+
+Full process verification is essential for PPAP approval and ensures manufacturing readiness.
+"""
+
+Q4_HEADER_MD = """
+---
+
+## Question 4: Process Parameter Specification
+
+Will the process be run at **fixed set points** without a range of process limits or parameters?
+"""
+
+Q4_INFO_MD = """
+**What this means:**
+- **Fixed setpoints (NOT recommended):** Process parameters are specified as exact single values
+  (e.g., Temperature = 280°C, Pressure = 1200 bar)
+- **Parameter ranges (RECOMMENDED):** Process parameters are specified with acceptable ranges
+  (e.g., Temperature = 280°C ± 5°C, Pressure = 1200 bar ± 50 bar)
+
+**Why ranges are required:**
+- Manufacturing processes naturally have variation
+- Parameter ranges demonstrate process understanding and robustness
+- Fixed setpoints without ranges do not meet PPAP requirements for production readiness
+"""
+
+Q4_WARNING_MD = """
+**Note:** If your process uses fixed setpoints without ranges, it may not be ready for PPAP approval.
+Robust manufacturing processes should define acceptable parameter ranges.
+"""
+
+ELIGIBLE_MD = """
+## ✅ System Suitable for Your PPAP
+
+Based on your responses, this PPAP AI Review System is appropriate for your use case.
+"""
+
+NEXT_STEPS_MD = """
+### Next Steps:
+1. Click "Proceed to PPAP Case Setup" below
+2. Create a new PPAP case with part details
+3. Upload required documents (FAIR, OQ, PQ)
+4. Use AI-powered analysis for document review
+
+### System Capabilities:
+- Automated PPAP checklist generation
+- Dimensional analysis from FAIR documents
+- Equipment qualification validation (OQ)
+- Statistical process control analysis (PQ)
+- Gap detection and recommendations
+- Comprehensive report generation
+"""
+
+UNVERIFIED_WARNING_MD = """
+**Note:** You indicated the process output is not fully verified. While you can proceed with
+the PPAP documentation review, please ensure process verification is completed before final
+PPAP approval. The system will flag any missing verification documentation.
+"""
+
+INELIGIBLE_MD = """
+## ⚠️ System Not Suitable for This PPAP
+
+Based on your responses, this PPAP AI Review System may not be appropriate for your use case.
+"""
+
+RECOMMENDED_ACTIONS_MD = """
+---
+
+### Recommended Actions:
+
+**For Non-Molding or Non-Surgical Unit PPAPs:**
+- Contact your business unit's PPAP coordinator for appropriate review processes
+- Different processes may have specialized requirements not covered by this system
+
+**For Legacy Product Parts:**
+- Check for existing PPAP tickets for the product
+- Coordinate with Quality Engineering to determine if documentation should be combined with previous approvals
+- Legacy product PPAPs may require a different workflow (to be added in future system updates)
+
+**For Fixed Setpoint Processes:**
+- Work with Process Engineering to establish acceptable parameter ranges
+- Complete process capability studies to determine appropriate tolerances
+- Ensure process robustness before proceeding with PPAP
+- Parameter ranges are essential for FDA compliance and manufacturing reliability
+
+### Need Help?
+If you believe your PPAP should be eligible or have questions about these requirements,
+please contact the PPAP Support Team or your Quality Engineering representative.
+
+---
+"""
+
+# Filled from st.session_state.survey_responses with format_map
+SURVEY_RESPONSES_MD = """
+- **Molding plastic processes under Surgical Operation Unit?** {q1_molding_surgical}
+- **New product part?** {q2_new_product}
+- **Process output fully verified?** {q3_process_verified}
+- **Fixed setpoints without parameter ranges?** {q4_fixed_setpoints}
+"""
 
 # ============================================================================
 # PPAP CASE FUNCTIONS
 # ============================================================================
 
-def add_activity_log(case_id, activity_type, description):
-    """Add entry to activity log for a PPAP case"""
-    if case_id not in st.session_state.activity_log:
-        st.session_state.activity_log[case_id] = []
-
-    st.session_state.activity_log[case_id].append({
-        'timestamp': datetime.now(),
-        'type': activity_type,
-        'description': description
-    })
+class CaseDraft(NamedTuple):
+    """Case metadata collected before its dimensions are entered"""
+    part_number: str
+    revision: str
+    supplier: str
+    qil: int
+    pc_count: int
+    ctf_count: int
+
+class LogEntry(NamedTuple):
+    """Single activity log entry"""
+    timestamp: datetime
+    type: str
+    description: str
+
+# Audit trail heading per activity type, formatted once instead of per entry
+ACTIVITY_HEADINGS = {
+    activity_type: f"{icon} **{activity_type.replace('_', ' ').title()}**"
+    for activity_type, icon in {
+        'CASE_CREATED': '📋',
+        'DOCUMENT_UPLOAD': '📤',
+        'AI_PROCESSING': '🤖',
+        'AI_ANALYSIS': '🔍',
+        'REPORT_GENERATED': '📄',
+        'CHAT_INTERACTION': '💬'
+    }.items()
+}
+
+def add_activity_log(case_id, activity_type, description, *, ts=None):
+    """Add entry to activity log for a PPAP case (log is created with the case)"""
+    st.session_state.activity_log[case_id].append(
+        LogEntry(ts or datetime.now(), activity_type, description)
+    )
 
 def create_new_case(part_number, revision, supplier, qil, pc, ctf, pc_dimensions, ctf_dimensions):
     """Create a new PPAP case"""
-    case_id = f"{part_number}_{revision}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    now = datetime.now()
+    case_id = f"{part_number}_{revision}_{now.strftime('%Y%m%d_%H%M%S')}"
 
     st.session_state.ppap_cases[case_id] = {
         'part_number': part_number,
@@ -150,7 +410,7 @@ def create_new_case(part_number, revision, supplier, qil, pc, ctf, pc_dimensions
         'qil': qil,
         'pc': pc,
         'ctf': ctf,
-        'created_date': datetime.now(),
+        'created_date': now,
         'documents': {
             'FAIR': [],
             'OQ': [],
@@ -158,26 +418,98 @@ def create_new_case(part_number, revision, supplier, qil, pc, ctf, pc_dimensions
             'Drawing': [],
             'Measurements': []
         },
+        # Maintained on upload so the Quick Stats metrics don't rescan every bucket
+        'document_count': 0,
+        'latest_version': 0,
         'checklist': None,
         'fair_analysis': None,
         'oq_analysis': None,
         'pq_analysis': None,
-        'survey_responses': st.session_state.survey_responses.copy()
+        # Shared, not copied: reset_survey() rebinds a fresh dict, so answers
+        # can't change under an existing case
+        'survey_responses': st.session_state.survey_responses
     }
 
+    st.session_state.activity_log[case_id] = []
+
     st.session_state.current_case_id = case_id
-    add_activity_log(case_id, 'CASE_CREATED', f'PPAP case created for {part_number} Rev {revision}')
+    add_activity_log(case_id, 'CASE_CREATED', f'PPAP case created for {part_number} Rev {revision}', ts=now)
 
     return case_id
 
 def get_current_case():
     """Get the currently selected PPAP case"""
-    if st.session_state.current_case_id:
-        return st.session_state.ppap_cases.get(st.session_state.current_case_id)
-    return None
+    case_id = st.session_state.current_case_id
+    return st.session_state.ppap_cases[case_id] if case_id else None
+
+def open_selected_case(option_ids):
+    """Case selector callback - switch to the workspace before anything renders"""
+    case_id = option_ids[st.session_state.case_select]
+    if case_id != "Create New Case":
+        st.session_state.current_case_id = case_id
+        st.session_state.page = "PPAP_WORKSPACE"
+
+def document_versions(case_docs):
+    """(doc type, versions newest first) for each document type with uploads"""
+    return [(doc_type_key, documents[::-1]) for doc_type_key, documents in case_docs.items() if documents]
+
+def open_chat(context):
+    """Chat button callback - focus the coaching chat on a (case, type, version)"""
+    st.session_state.active_chat_context = context
+    st.session_state.workspace_tab = WORKSPACE_TABS[-1]
+
+def show_earlier_messages(visible_key):
+    """Chat "Load earlier" callback - double the rendered message window"""
+    st.session_state[visible_key] = st.session_state.get(visible_key, CHAT_VISIBLE_MESSAGES) * 2
+
+@st.cache_data(show_spinner=False, max_entries=CASE_CACHE_ENTRIES)
+def case_option_labels(case_keys):
+    """Selectbox labels keyed by case id, from (case_id, part_number, revision) rows"""
+    return {case_id: f"{part_number} Rev {revision}" for case_id, part_number, revision in case_keys}
+
+# Mock analysis tables are constant - build them once per process instead of
+# on every script rerun
+
+@st.cache_resource(show_spinner=False)
+def _fair_dims_df():
+    """Mock FAIR dimensional table"""
+    return pd.DataFrame({
+        'Balloon_ID': ['1', '2', '3', '4', '5', '6', '7', '8'],
+        'Dimension': ['Overall Length', 'Inner Diameter', 'Wall Thickness', 'Boss Height', 'Hole Diameter', 'Surface Finish', 'Thread Depth', 'Concentricity'],
+        'Nominal': [125.0, 25.4, 2.5, 8.0, 6.35, 0.8, 5.0, 0.05],
+        'USL': [125.5, 25.6, 2.6, 8.2, 6.40, 1.2, 5.2, 0.10],
+        'LSL': [124.5, 25.2, 2.4, 7.8, 6.30, 0.4, 4.8, 0.00],
+        'Measured': [125.1, 25.42, 2.51, 8.05, 6.36, 0.75, 5.03, 0.03],
+        'Tolerance_Used_%': [20, 40, 20, 25, 20, 37.5, 15, 30],
+        'Status': ['Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass']
+    })
+
+@st.cache_resource(show_spinner=False)
+def _oq_equipment_df():
+    """Mock OQ equipment table"""
+    return pd.DataFrame({
+        'Equipment': ['Injection Molding Machine', 'Temperature Controller', 'Mold Assembly', 'Material Dryer'],
+        'Model': ['Engel Victory 200', 'Mold-Masters Summit', 'Custom Mold #8891', 'Motan Luxor'],
+        'Serial_Number': ['ENG-200-4478', 'MM-SUM-9921', 'MM-8891', 'MLX-3344'],
+        'Calibration_Status': ['Valid until 06/2026', 'Valid until 08/2026', 'N/A', 'Valid until 12/2025'],
+        'Status': ['Qualified', 'Qualified', 'Qualified', 'Qualified']
+    })
 
-def mock_ai_checklist_generation():
-    """Mock AI-generated PPAP checklist"""
+@st.cache_resource(show_spinner=False)
+def _pq_spc_df():
+    """Mock PQ SPC table"""
+    return pd.DataFrame({
+        'Parameter': ['Overall Length', 'Inner Diameter', 'Wall Thickness', 'Boss Height'],
+        'Mean': [125.08, 25.41, 2.502, 8.03],
+        'StdDev': [0.08, 0.06, 0.015, 0.04],
+        'Cp': [2.08, 1.67, 2.22, 2.50],
+        'Cpk': [1.87, 1.50, 1.93, 2.25],
+        'Status': ['Pass (Cpk>1.33)', 'Pass (Cpk>1.33)', 'Pass (Cpk>1.33)', 'Pass (Cpk>1.33)']
+    })
+
+@st.cache_data(show_spinner="Analyzing...", ttl=24 * 60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def mock_ai_checklist_generation(case_id, doc_versions):
+    """Mock AI-generated PPAP checklist, cached per case and latest document versions"""
     return {
         'total_items': 24,
         'satisfied': 18,
@@ -196,38 +528,25 @@ def mock_ai_checklist_generation():
         ]
     }
 
-def mock_fair_analysis():
-    """Mock FAIR document analysis results"""
+@st.cache_data(show_spinner="Analyzing...", ttl=24 * 60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def mock_fair_analysis(case_id, version):
+    """Mock FAIR document analysis results, cached per case and FAIR version"""
     return {
         'dimensions_extracted': 47,
         'critical_dimensions': 12,
-        'dimensions': pd.DataFrame({
-            'Balloon_ID': ['1', '2', '3', '4', '5', '6', '7', '8'],
-            'Dimension': ['Overall Length', 'Inner Diameter', 'Wall Thickness', 'Boss Height', 'Hole Diameter', 'Surface Finish', 'Thread Depth', 'Concentricity'],
-            'Nominal': [125.0, 25.4, 2.5, 8.0, 6.35, 0.8, 5.0, 0.05],
-            'USL': [125.5, 25.6, 2.6, 8.2, 6.40, 1.2, 5.2, 0.10],
-            'LSL': [124.5, 25.2, 2.4, 7.8, 6.30, 0.4, 4.8, 0.00],
-            'Measured': [125.1, 25.42, 2.51, 8.05, 6.36, 0.75, 5.03, 0.03],
-            'Tolerance_Used_%': [20, 40, 20, 25, 20, 37.5, 15, 30],
-            'Status': ['Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass']
-        }),
+        'dimensions': _fair_dims_df(),
         'material': 'Polycarbonate (PC) - Medical Grade',
         'supplier_cert': 'ISO 13485 Certified',
         'traceability': 'Lot# PCM-2024-8891'
     }
 
-def mock_oq_analysis():
-    """Mock OQ document analysis results"""
+@st.cache_data(show_spinner="Analyzing...", ttl=24 * 60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def mock_oq_analysis(case_id, version):
+    """Mock OQ document analysis results, cached per case and OQ version"""
     return {
         'sections_found': ['Equipment List', 'Process Parameters', 'Qualification Protocol', 'Test Results'],
         'sections_missing': ['Maintenance Schedule', 'Calibration Certificates'],
-        'equipment': pd.DataFrame({
-            'Equipment': ['Injection Molding Machine', 'Temperature Controller', 'Mold Assembly', 'Material Dryer'],
-            'Model': ['Engel Victory 200', 'Mold-Masters Summit', 'Custom Mold #8891', 'Motan Luxor'],
-            'Serial_Number': ['ENG-200-4478', 'MM-SUM-9921', 'MM-8891', 'MLX-3344'],
-            'Calibration_Status': ['Valid until 06/2026', 'Valid until 08/2026', 'N/A', 'Valid until 12/2025'],
-            'Status': ['Qualified', 'Qualified', 'Qualified', 'Qualified']
-        }),
+        'equipment': _oq_equipment_df(),
         'process_params': {
             'Injection Pressure': '1200 bar ± 50',
             'Melt Temperature': '280°C ± 5°C',
@@ -238,309 +557,424 @@ def mock_oq_analysis():
         'validation_status': 'Partially Complete'
     }
 
-def mock_pq_analysis():
-    """Mock PQ document analysis results"""
+@st.cache_data(show_spinner="Analyzing...", ttl=24 * 60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def mock_pq_analysis(case_id, version):
+    """Mock PQ document analysis results, cached per case and PQ version"""
     return {
         'production_run_size': 50,
         'required_run_size': 30,
         'run_status': 'Sufficient',
-        'spc_data': pd.DataFrame({
-            'Parameter': ['Overall Length', 'Inner Diameter', 'Wall Thickness', 'Boss Height'],
-            'Mean': [125.08, 25.41, 2.502, 8.03],
-            'StdDev': [0.08, 0.06, 0.015, 0.04],
-            'Cp': [2.08, 1.67, 2.22, 2.50],
-            'Cpk': [1.87, 1.50, 1.93, 2.25],
-            'Status': ['Pass (Cpk>1.33)', 'Pass (Cpk>1.33)', 'Pass (Cpk>1.33)', 'Pass (Cpk>1.33)']
-        }),
+        'spc_data': _pq_spc_df(),
         'defect_rate': '0.02% (1 reject in 50 parts)',
         'first_pass_yield': '98%',
         'validation_notes': 'Production process demonstrated adequate capability for all critical dimensions.'
     }
 
+@st.cache_data(show_spinner=False)
+def checklist_view(items, categories, statuses):
+    """Checklist rows matching the category/status filters, plus all missing rows"""
+    df = pd.DataFrame.from_records(
+        items, columns=['category', 'requirement', 'status', 'evidence']
+    ).astype({'category': 'category', 'status': 'category'})
+    filtered = df[df['category'].isin(categories) & df['status'].isin(statuses)]
+    return filtered, df[df['status'] == 'Missing']
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def build_mock_report(part_number, revision, supplier):
+    """Mock PPAP summary report bytes, built once per case header"""
+    return f"""
+PPAP Summary Report
+Part Number: {part_number}
+Revision: {revision}
+Supplier: {supplier}
+
+This is a mock report for demonstration purposes.
+""".encode()
+
+# Table stylers for Styler.apply(axis=None) - one vectorized pass per table
+# instead of a Python call per row
+
+def highlight_status(df):
+    """Checklist rows: red for missing requirements, green otherwise"""
+    colors = np.where(df['status'].to_numpy() == 'Missing', 'background-color: #ffebee', 'background-color: #e8f5e9')
+    return pd.DataFrame(np.repeat(colors[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
+
+@st.cache_resource(show_spinner=False)
+def style_thresholds():
+    """Threshold bins and the colour for each bin (for np.digitize), built once per process"""
+    return {
+        'tolerance': (
+            np.array([60, 80]),
+            np.array(['background-color: #e8f5e9', 'background-color: #fff3e0', 'background-color: #ffebee'])
+        ),
+        'cpk': (
+            np.array([1.33, 1.67]),
+            np.array(['background-color: #ffebee', 'background-color: #fff3e0', 'background-color: #e8f5e9'])
+        ),
+    }
+
+def highlight_tolerance(df):
+    """FAIR dimensions: colour tolerance used, red >80%, orange >60%, else green"""
+    styles = pd.DataFrame('', index=df.index, columns=df.columns)
+    bins, colors = style_thresholds()['tolerance']
+    styles['Tolerance_Used_%'] = colors[np.digitize(df['Tolerance_Used_%'].to_numpy(), bins, right=True)]
+    return styles
+
+def highlight_cpk(df):
+    """PQ SPC data: colour Cpk, green >=1.67, orange >=1.33, else red"""
+    styles = pd.DataFrame('', index=df.index, columns=df.columns)
+    bins, colors = style_thresholds()['cpk']
+    styles['Cpk'] = colors[np.digitize(df['Cpk'].to_numpy(), bins)]
+    return styles
+
+@st.cache_resource(show_spinner=False)
+def load_logo():
+    """Read the logo once per process; None if the file is missing"""
+    try:
+        with open(LOGO_PATH, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def centered_column(width):
+    """Middle column of a [1, width, 1] layout; the side spacers are never used"""
+    return st.columns([1, width, 1])[1]
+
 def render_dimension_grid(prefix, count, step=0.01):
     """
-    Renders numeric inputs in a 3-column grid.
+    Renders one editable table with a row per dimension.
     Returns a list of entered values.
     """
-    values = []
-
-    for i in range(0, count, 3):
-        cols = st.columns(3)
-        for j in range(3):
-            idx = i + j
-            if idx < count:
-                with cols[j]:
-                    val = st.number_input(
-                        f"{prefix} Dimension {idx + 1}",
-                        key=f"{prefix.lower()}_dim_{idx}",
-                        step=step
-                    )
-                    values.append(val)
+    table = st.data_editor(
+        pd.DataFrame({
+            "Dimension": [f"{prefix} Dimension {idx + 1}" for idx in range(count)],
+            "Value": [0.0] * count,
+        }),
+        key=f"{prefix.lower()}_dims",
+        column_config={"Value": st.column_config.NumberColumn(step=step)},
+        disabled=["Dimension"],
+        hide_index=True,
+        use_container_width=True
+    )
 
-    return values
+    return table["Value"].tolist()
 
-# Initialize session state
-init_session_state()
+# ============================================================================
+# CASE SETUP PAGE
+# ============================================================================
+
+@st.fragment
+def new_case_form():
+    """New case form - a failed submit reruns only the form, not case setup"""
+    st.subheader("Create New PPAP Case")
+
+    with st.form("new_case_form"):
+        part_number = st.text_input("Part Number", placeholder="e.g., MED-12345", key="new_case_part_number")
+        revision = st.text_input("Revision", placeholder="e.g., A, B, C", key="new_case_revision")
+        supplier = st.text_input("Supplier", placeholder="e.g., Supplier XYZ", key="new_case_supplier")
+
+        qil = st.selectbox("QIL (Quality Impact Level)", [1, 2, 3, 4, 5, 6, 7], index=2, help="QIL 3 & 4 are within typical project scope", key="new_case_qil")
+        pc_count = st.number_input("PC (Number of Dimensions)", min_value=0, value=0, step=1, key="new_case_pc_count")
+        ctf_count = st.number_input("CTF (Number of Dimensions)", min_value=0, value=0, step=1, key="new_case_ctf_count")
+
+        submitted = st.form_submit_button("Create Case")
+
+        if submitted:
+            missing = [
+                name for name, value in (
+                    ("Part Number", part_number),
+                    ("Revision", revision),
+                    ("Supplier", supplier),
+                )
+                if not value
+            ]
+            if missing:
+                st.error(f"Please fill all required fields: {', '.join(missing)}")
+                st.stop()
+
+            # Store metadata + counts only and move to dimension input step
+            st.session_state.update({
+                "new_case_draft": CaseDraft(part_number, revision, supplier, qil, pc_count, ctf_count),
+                "page": "DIMENSIONS_SETUP",
+            })
+            st.rerun(scope="app")
+
+
+        # if submitted:
+        #     if part_number and revision and supplier:
+        #         create_new_case(
+        #             part_number,
+        #             revision,
+        #             supplier,
+        #             qil,
+        #             pc_count,
+        #             ctf_count
+        #         )
+        #         st.session_state.page = "PPAP_WORKSPACE"
+        #         st.rerun()
+        #     else:
+        #         st.error("Please fill all required fields")
+
+@st.fragment
+def case_setup_page():
+    """Case selection / creation page, rerun on its own for widget changes"""
+    ensure_page("CASE_SETUP")
+
+    st.title("Generative AI Tool for PPAP Document Review")
+    st.markdown("### Medtronic Capstone Project")
+    st.markdown("---")
+
+    # Center the content
+    with centered_column(2):
+        with st.container(border=True):
+            logo = load_logo()
+            if logo:
+                st.image(logo, width=120)
+            st.html(INTERNAL_BADGE_HTML + "<hr>")
+
+            # Show survey completion status
+            if st.session_state.survey_eligible:
+                st.success("✅ Eligibility Survey Completed - System Suitable")
+                # Collapsed expanders still build their body; a toggle skips it
+                if st.toggle("View Survey Responses", key="show_survey_responses"):
+                    st.markdown(SURVEY_RESPONSES_MD.format_map(st.session_state.survey_responses))
+                st.divider()
+
+            st.header("PPAP Case Setup")
+
+            # Select existing case
+            if len(st.session_state.ppap_cases) > 0:
+                case_options = case_option_labels(tuple(
+                    (case_id, case['part_number'], case['revision'])
+                    for case_id, case in st.session_state.ppap_cases.items()
+                ))
+
+                option_ids = ("Create New Case", *case_options)
+                labels = ("Create New Case", *case_options.values())
+
+                selected_case = option_ids[st.selectbox(
+                    "Select PPAP Case",
+                    options=range(len(option_ids)),
+                    format_func=labels.__getitem__,
+                    key="case_select",
+                    on_change=open_selected_case,
+                    args=(option_ids,)
+                )]
+            else:
+                selected_case = "Create New Case"
+
+            # Create new case
+            if selected_case == "Create New Case":
+                new_case_form()
+
+            st.markdown("---")
+
+            st.button("⬅ Back to Survey", on_click=set_page, args=("SURVEY_RESULT",))
+
+# ============================================================================
+# DIMENSIONS SETUP PAGE
+# ============================================================================
+
+@st.fragment
+def dimensions_setup_page():
+    """PC & CTF dimension entry page, rerun on its own for widget changes"""
+    ensure_page("DIMENSIONS_SETUP")
+
+    st.title("Define Critical Dimensions")
+    st.markdown("### PC & CTF Dimension Setup")
+    st.markdown("---")
+
+    # Safety check (important)
+    if "new_case_draft" not in st.session_state:
+        st.warning("No active case draft found. Returning to Case Setup.")
+        st.session_state.page = "CASE_SETUP"
+        st.rerun(scope="app")
+
+    draft = st.session_state.new_case_draft
+
+    # PC Dimensions
+    if draft.pc_count > 0:
+        st.subheader("PC Dimensions")
+        pc_dims = render_dimension_grid("PC", draft.pc_count)
+    else:
+        pc_dims = []
+
+    st.divider()
+
+    # CTF Dimensions
+    if draft.ctf_count > 0:
+        st.subheader("CTF Dimensions")
+        ctf_dims = render_dimension_grid("CTF", draft.ctf_count)
+    else:
+        ctf_dims = []
+
+    st.divider()
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.button("⬅ Back to Case Setup", on_click=set_page, args=("CASE_SETUP",))
+
+    with col2:
+        if st.button("✅ Create Case", type="primary"):
+            create_new_case(*draft, pc_dims, ctf_dims)
+            st.session_state.page = "PPAP_WORKSPACE"
+            st.rerun(scope="app")
 
 # ============================================================================
 # SURVEY PAGES
 # ============================================================================
 
-if st.session_state.page in ["SURVEY_WELCOME", "SURVEY_Q1", "SURVEY_Q2", "SURVEY_Q3", "SURVEY_Q4", "SURVEY_RESULT"]:
+def survey_page():
+    """Eligibility survey - welcome, the four questions and the result"""
     # Center the content
-    left_space, center_col, right_space = st.columns([1, 3, 1])
-
-    with center_col:
+    with centered_column(3):
         # Header section
         st.title("PPAP Eligibility Survey")
         st.markdown("### Medtronic PPAP Document Review System")
 
         with st.container(border=True):
-            try:
-                st.image("assets/images.png", width=120)
-            except:
-                pass  # Image not found, continue without it
-            st.markdown("### 🔒 Internal Use Only")
-            st.caption("Medtronic • Secure Network • Internal LLM")
+            logo = load_logo()
+            if logo:
+                st.image(logo, width=120)
+            st.html(INTERNAL_BADGE_HTML)
 
         st.markdown("---")
 
+        # Progress indicator (question pages only)
+        progress = SURVEY_PROGRESS.get(st.session_state.page)
+        if progress:
+            st.progress(progress[0])
+            st.caption(progress[1])
+
         # ====================================================================
         # WELCOME PAGE
         # ====================================================================
         if st.session_state.page == "SURVEY_WELCOME":
-            st.markdown("""
-            ## Welcome to the PPAP Review System
-
-            This tool automates the review of PPAP (Production Part Approval Process) documentation
-            for **injection-molded plastic parts** within the **Surgical Operation Unit**.
-
-            Before creating a PPAP case, please complete a brief eligibility survey to ensure
-            this system is appropriate for your specific PPAP requirements.
-
-            ### What You'll Need to Know:
-            - Process type and business unit
-            - Product classification (new vs. legacy)
-            - Process verification status
-            - Process parameter specifications
-
-            The survey takes approximately **1-2 minutes** to complete.
-            """)
-
-            st.markdown("---")
+            st.markdown(WELCOME_MD)
 
             if st.button("Begin Eligibility Survey", type="primary", use_container_width=True):
-                st.session_state.page = "SURVEY_Q1"
-                st.rerun()
+                go_to_page("SURVEY_Q1")
 
         # ====================================================================
         # QUESTION 1
         # ====================================================================
         elif st.session_state.page == "SURVEY_Q1":
-            st.progress(0.25)
-            st.caption("Question 1 of 4")
-            st.markdown("---")
-
-            st.markdown("""
-            ## Question 1: Process Type and Business Unit
-
-            Is this PPAP associated with **molding plastic processes** under the **Surgical Operation Unit**?
-            """)
+            st.markdown(Q1_HEADER_MD)
 
             with st.container(border=True):
-                st.info("""
-                **What this means:**
-                - **Molding plastic processes:** Injection molding or similar plastic manufacturing processes
-                - **Surgical Operation Unit:** Business unit responsible for surgical devices and components
-
-                This system is specifically designed for plastic molding processes within the Surgical Operation Unit.
-                """)
+                st.info(Q1_INFO_MD)
 
             col1, col2 = st.columns(2)
 
             with col1:
                 if st.button("✅ Yes", use_container_width=True, type="primary"):
-                    st.session_state.survey_responses['q1_molding_surgical'] = 'Yes'
-                    st.session_state.page = "SURVEY_Q2"
-                    st.rerun()
+                    record_answer('q1_molding_surgical', 'Yes', "SURVEY_Q2")
 
             with col2:
                 if st.button("❌ No", use_container_width=True):
-                    st.session_state.survey_responses['q1_molding_surgical'] = 'No'
-                    st.session_state.page = "SURVEY_RESULT"
-                    st.rerun()
+                    record_answer('q1_molding_surgical', 'No', "SURVEY_RESULT")
 
             st.markdown("---")
 
             if st.button("⬅ Back to Welcome"):
-                st.session_state.page = "SURVEY_WELCOME"
-                st.rerun()
+                go_to_page("SURVEY_WELCOME")
 
         # ====================================================================
         # QUESTION 2
         # ====================================================================
         elif st.session_state.page == "SURVEY_Q2":
-            st.progress(0.50)
-            st.caption("Question 2 of 4")
-            st.markdown("---")
-
-            st.markdown("""
-            ## Question 2: Product Classification
-
-            Is this PPAP associated with a **new product part**?
-            """)
+            st.markdown(Q2_HEADER_MD)
 
             with st.container(border=True):
-                st.info("""
-                **What this means:**
-                - **New product part:** A part that has not been previously manufactured or approved
-                - **Not a new product part:** Legacy products, existing parts with revisions, or previously approved parts
-
-                This system currently supports new product parts only. Legacy products require different workflows
-                (such as checking for previously approved PPAP tickets and combining documentation).
-                """)
+                st.info(Q2_INFO_MD)
 
             col1, col2 = st.columns(2)
 
             with col1:
                 if st.button("✅ Yes", use_container_width=True, type="primary"):
-                    st.session_state.survey_responses['q2_new_product'] = 'Yes'
-                    st.session_state.page = "SURVEY_Q3"
-                    st.rerun()
+                    record_answer('q2_new_product', 'Yes', "SURVEY_Q3")
 
             with col2:
                 if st.button("❌ No", use_container_width=True):
-                    st.session_state.survey_responses['q2_new_product'] = 'No'
-                    st.session_state.page = "SURVEY_RESULT"
-                    st.rerun()
+                    record_answer('q2_new_product', 'No', "SURVEY_RESULT")
 
             st.markdown("---")
 
             if st.button("⬅ Back to Question 1"):
-                st.session_state.page = "SURVEY_Q1"
-                st.rerun()
+                go_to_page("SURVEY_Q1")
 
         # ====================================================================
         # QUESTION 3
         # ====================================================================
         elif st.session_state.page == "SURVEY_Q3":
-            st.progress(0.75)
-            st.caption("Question 3 of 4")
-            st.markdown("---")
-
-            st.markdown("""
-            ## Question 3: Process Verification Status
-
-            Is the **process output fully verified**?
-            """)
+            st.markdown(Q3_HEADER_MD)
 
             with st.container(border=True):
-                st.info("""
-                **What this means:**
-                - **Fully verified:** The manufacturing process has been validated and produces consistent,
-                  specification-compliant parts
-                - Process capability studies (Cpk) have been completed
-                - First article inspection has been performed
-                - Production runs demonstrate consistent output
-
-                Full process verification is essential for PPAP approval and ensures manufacturing readiness.
-                """)
+                st.info(Q3_INFO_MD)
 
             col1, col2 = st.columns(2)
 
             with col1:
                 if st.button("✅ Yes", use_container_width=True, type="primary"):
-                    st.session_state.survey_responses['q3_process_verified'] = 'Yes'
-                    st.session_state.page = "SURVEY_Q4"
-                    st.rerun()
+                    record_answer('q3_process_verified', 'Yes', "SURVEY_Q4")
 
             with col2:
                 if st.button("❌ No", use_container_width=True):
-                    st.session_state.survey_responses['q3_process_verified'] = 'No'
-                    st.session_state.page = "SURVEY_Q4"
-                    st.rerun()
+                    record_answer('q3_process_verified', 'No', "SURVEY_Q4")
 
             st.markdown("---")
 
             if st.button("⬅ Back to Question 2"):
-                st.session_state.page = "SURVEY_Q2"
-                st.rerun()
+                go_to_page("SURVEY_Q2")
 
         # ====================================================================
         # QUESTION 4
         # ====================================================================
         elif st.session_state.page == "SURVEY_Q4":
-            st.progress(1.0)
-            st.caption("Question 4 of 4")
-            st.markdown("---")
-
-            st.markdown("""
-            ## Question 4: Process Parameter Specification
-
-            Will the process be run at **fixed set points** without a range of process limits or parameters?
-            """)
+            st.markdown(Q4_HEADER_MD)
 
             with st.container(border=True):
-                st.info("""
-                **What this means:**
-                - **Fixed setpoints (NOT recommended):** Process parameters are specified as exact single values
-                  (e.g., Temperature = 280°C, Pressure = 1200 bar)
-                - **Parameter ranges (RECOMMENDED):** Process parameters are specified with acceptable ranges
-                  (e.g., Temperature = 280°C ± 5°C, Pressure = 1200 bar ± 50 bar)
-
-                **Why ranges are required:**
-                - Manufacturing processes naturally have variation
-                - Parameter ranges demonstrate process understanding and robustness
-                - Fixed setpoints without ranges do not meet PPAP requirements for production readiness
-                """)
+                st.info(Q4_INFO_MD)
 
-            st.warning("""
-            **Note:** If your process uses fixed setpoints without ranges, it may not be ready for PPAP approval.
-            Robust manufacturing processes should define acceptable parameter ranges.
-            """)
+            st.warning(Q4_WARNING_MD)
 
             col1, col2 = st.columns(2)
 
             with col1:
                 if st.button("Yes - Fixed setpoints only", use_container_width=True):
-                    st.session_state.survey_responses['q4_fixed_setpoints'] = 'Yes'
-                    st.session_state.page = "SURVEY_RESULT"
-                    st.rerun()
+                    record_answer('q4_fixed_setpoints', 'Yes', "SURVEY_RESULT")
 
             with col2:
                 if st.button("✅ No - Has parameter ranges", use_container_width=True, type="primary"):
-                    st.session_state.survey_responses['q4_fixed_setpoints'] = 'No'
-                    st.session_state.page = "SURVEY_RESULT"
-                    st.rerun()
+                    record_answer('q4_fixed_setpoints', 'No', "SURVEY_RESULT")
 
             st.markdown("---")
 
             if st.button("⬅ Back to Question 3"):
-                st.session_state.page = "SURVEY_Q3"
-                st.rerun()
+                go_to_page("SURVEY_Q3")
 
         # ====================================================================
         # RESULT PAGE
         # ====================================================================
         elif st.session_state.page == "SURVEY_RESULT":
-            st.markdown("---")
-
             # Determine eligibility
             is_eligible = check_eligibility()
             st.session_state.survey_eligible = is_eligible
             st.session_state.survey_completion_date = datetime.now()
 
             # Display survey summary
-            st.markdown("## Survey Summary")
+            st.markdown("---\n\n## Survey Summary")
 
+            responses = st.session_state.survey_responses
             with st.container(border=True):
-                st.markdown("### Your Responses:")
-                st.markdown(f"""
-                1. **Molding plastic processes under Surgical Operation Unit?** {st.session_state.survey_responses['q1_molding_surgical']}
-                2. **New product part?** {st.session_state.survey_responses['q2_new_product']}
-                3. **Process output fully verified?** {st.session_state.survey_responses['q3_process_verified']}
-                4. **Fixed setpoints without parameter ranges?** {st.session_state.survey_responses['q4_fixed_setpoints']}
-                """)
+                st.markdown("\n".join([
+                    "### Your Responses:",
+                    f"1. **Molding plastic processes under Surgical Operation Unit?** {responses['q1_molding_surgical']}",
+                    f"2. **New product part?** {responses['q2_new_product']}",
+                    f"3. **Process output fully verified?** {responses['q3_process_verified']}",
+                    f"4. **Fixed setpoints without parameter ranges?** {responses['q4_fixed_setpoints']}",
+                ]))
 
             st.markdown("---")
 
@@ -548,43 +982,19 @@ if st.session_state.page in ["SURVEY_WELCOME", "SURVEY_Q1", "SURVEY_Q2", "SURVEY
             # ELIGIBLE RESULT
             # ================================================================
             if is_eligible:
-                st.success("""
-                ## ✅ System Suitable for Your PPAP
-
-                Based on your responses, this PPAP AI Review System is appropriate for your use case.
-                """)
+                st.success(ELIGIBLE_MD)
 
-                st.markdown("""
-                ### Next Steps:
-                1. Click "Proceed to PPAP Case Setup" below
-                2. Create a new PPAP case with part details
-                3. Upload required documents (FAIR, OQ, PQ)
-                4. Use AI-powered analysis for document review
-
-                ### System Capabilities:
-                - Automated PPAP checklist generation
-                - Dimensional analysis from FAIR documents
-                - Equipment qualification validation (OQ)
-                - Statistical process control analysis (PQ)
-                - Gap detection and recommendations
-                - Comprehensive report generation
-                """)
+                st.markdown(NEXT_STEPS_MD)
 
                 # Additional notes based on Q3
-                if st.session_state.survey_responses['q3_process_verified'] == 'No':
-                    st.warning("""
-                    **Note:** You indicated the process output is not fully verified. While you can proceed with
-                    the PPAP documentation review, please ensure process verification is completed before final
-                    PPAP approval. The system will flag any missing verification documentation.
-                    """)
+                if responses['q3_process_verified'] == 'No':
+                    st.warning(UNVERIFIED_WARNING_MD)
 
                 st.markdown("---")
 
-                col1, col2, col3 = st.columns([1, 2, 1])
-                with col2:
+                with centered_column(2):
                     if st.button("🚀 Proceed to PPAP Case Setup", type="primary", use_container_width=True):
-                        st.session_state.page = "CASE_SETUP"
-                        st.rerun()
+                        go_to_page("CASE_SETUP")
 
                     st.markdown("---")
 
@@ -596,11 +1006,7 @@ if st.session_state.page in ["SURVEY_WELCOME", "SURVEY_Q1", "SURVEY_Q2", "SURVEY
             # INELIGIBLE RESULT
             # ================================================================
             else:
-                st.error("""
-                ## ⚠️ System Not Suitable for This PPAP
-
-                Based on your responses, this PPAP AI Review System may not be appropriate for your use case.
-                """)
+                st.error(INELIGIBLE_MD)
 
                 st.markdown("### Reasons for Incompatibility:")
 
@@ -612,32 +1018,7 @@ if st.session_state.page in ["SURVEY_WELCOME", "SURVEY_Q1", "SURVEY_Q2", "SURVEY
                         st.markdown(f"**Your Response:** {reason['response']}")
                         st.markdown(f"**Explanation:** {reason['explanation']}")
 
-                st.markdown("---")
-
-                st.markdown("""
-                ### Recommended Actions:
-
-                **For Non-Molding or Non-Surgical Unit PPAPs:**
-                - Contact your business unit's PPAP coordinator for appropriate review processes
-                - Different processes may have specialized requirements not covered by this system
-
-                **For Legacy Product Parts:**
-                - Check for existing PPAP tickets for the product
-                - Coordinate with Quality Engineering to determine if documentation should be combined with previous approvals
-                - Legacy product PPAPs may require a different workflow (to be added in future system updates)
-
-                **For Fixed Setpoint Processes:**
-                - Work with Process Engineering to establish acceptable parameter ranges
-                - Complete process capability studies to determine appropriate tolerances
-                - Ensure process robustness before proceeding with PPAP
-                - Parameter ranges are essential for FDA compliance and manufacturing reliability
-
-                ### Need Help?
-                If you believe your PPAP should be eligible or have questions about these requirements,
-                please contact the PPAP Support Team or your Quality Engineering representative.
-                """)
-
-                st.markdown("---")
+                st.markdown(RECOMMENDED_ACTIONS_MD)
 
                 col1, col2 = st.columns(2)
 
@@ -654,187 +1035,86 @@ if st.session_state.page in ["SURVEY_WELCOME", "SURVEY_Q1", "SURVEY_Q2", "SURVEY
     st.markdown("---")
     st.caption("Medtronic PPAP Document Review System • Capstone Project Prototype • Version 1.0")
 
-# ============================================================================
-# CASE SETUP PAGE
-# ============================================================================
-
-elif st.session_state.page == "CASE_SETUP":
-    st.title("Generative AI Tool for PPAP Document Review")
-    st.markdown("### Medtronic Capstone Project")
-    st.markdown("---")
-
-    # Center the content
-    left, center, right = st.columns([1, 2, 1])
-
-    with center:
-        with st.container(border=True):
-            try:
-                st.image("assets/images.png", width=120)
-            except:
-                pass  # Image not found, continue without it
-            st.markdown("### 🔒 Internal Use Only")
-            st.caption("Medtronic • Secure Network • Internal LLM")
-            st.divider()
-
-            # Show survey completion status
-            if st.session_state.survey_eligible:
-                st.success("✅ Eligibility Survey Completed - System Suitable")
-                with st.expander("View Survey Responses"):
-                    st.markdown(f"""
-                    - **Molding plastic processes under Surgical Operation Unit?** {st.session_state.survey_responses['q1_molding_surgical']}
-                    - **New product part?** {st.session_state.survey_responses['q2_new_product']}
-                    - **Process output fully verified?** {st.session_state.survey_responses['q3_process_verified']}
-                    - **Fixed setpoints without parameter ranges?** {st.session_state.survey_responses['q4_fixed_setpoints']}
-                    """)
-                st.divider()
-
-            st.header("PPAP Case Setup")
-
-            # Select existing case
-            if len(st.session_state.ppap_cases) > 0:
-                case_options = {
-                    case_id: f"{case['part_number']} Rev {case['revision']}"
-                    for case_id, case in st.session_state.ppap_cases.items()
-                }
-
-                selected_case = st.selectbox(
-                    "Select PPAP Case",
-                    options=["Create New Case"] + list(case_options.keys()),
-                    format_func=lambda x: x if x == "Create New Case" else case_options[x]
-                )
-
-                if selected_case != "Create New Case":
-                    st.session_state.current_case_id = selected_case
-                    st.session_state.page = "PPAP_WORKSPACE"
-                    st.rerun()
-            else:
-                selected_case = "Create New Case"
-
-            # Create new case
-            if selected_case == "Create New Case":
-                st.subheader("Create New PPAP Case")
-
-                with st.form("new_case_form"):
-                    part_number = st.text_input("Part Number", placeholder="e.g., MED-12345")
-                    revision = st.text_input("Revision", placeholder="e.g., A, B, C")
-                    supplier = st.text_input("Supplier", placeholder="e.g., Supplier XYZ")
-
-                    qil = st.selectbox("QIL (Quality Impact Level)", [1, 2, 3, 4, 5, 6, 7], index=2, help="QIL 3 & 4 are within typical project scope")
-                    pc_count = st.number_input("PC (Number of Dimensions)", min_value=0, step=1)
-                    ctf_count = st.number_input("CTF (Number of Dimensions)", min_value=0, step=1)
-
-                    submitted = st.form_submit_button("Create Case")
-
-                    if submitted:
-                        if part_number and revision and supplier:
-                            # Store metadata + counts only
-                            st.session_state.new_case_draft = {
-                                "part_number": part_number,
-                                "revision": revision,
-                                "supplier": supplier,
-                                "qil": qil,
-                                "pc_count": int(pc_count),
-                                "ctf_count": int(ctf_count),
-                            }
-
-                            # Move to dimension input step
-                            st.session_state.page = "DIMENSIONS_SETUP"
-                            st.rerun()
-                        else:
-                            st.error("Please fill all required fields")
-
-
-                    # if submitted:
-                    #     if part_number and revision and supplier:
-                    #         create_new_case(
-                    #             part_number,
-                    #             revision,
-                    #             supplier,
-                    #             qil,
-                    #             pc_count,
-                    #             ctf_count
-                    #         )
-                    #         st.session_state.page = "PPAP_WORKSPACE"
-                    #         st.rerun()
-                    #     else:
-                    #         st.error("Please fill all required fields")
-
-            st.markdown("---")
-
-            if st.button("⬅ Back to Survey"):
-                st.session_state.page = "SURVEY_RESULT"
-                st.rerun()
-
-elif st.session_state.page == "DIMENSIONS_SETUP":
-
-    st.title("Define Critical Dimensions")
-    st.markdown("### PC & CTF Dimension Setup")
-    st.markdown("---")
-
-    # Safety check (important)
-    if "new_case_draft" not in st.session_state:
-        st.warning("No active case draft found. Returning to Case Setup.")
-        st.session_state.page = "CASE_SETUP"
-        st.rerun()
-
-    draft = st.session_state.new_case_draft
-
-    # PC Dimensions
-    if draft["pc_count"] > 0:
-        st.subheader("PC Dimensions")
-        pc_dims = render_dimension_grid("PC", draft["pc_count"])
-    else:
-        pc_dims = []
-
-    st.divider()
-
-    # CTF Dimensions
-    if draft["ctf_count"] > 0:
-        st.subheader("CTF Dimensions")
-        ctf_dims = render_dimension_grid("CTF", draft["ctf_count"])
-    else:
-        ctf_dims = []
-
-    st.divider()
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        if st.button("⬅ Back to Case Setup"):
-            st.session_state.page = "CASE_SETUP"
-            st.rerun()
-
-    with col2:
-        if st.button("✅ Create Case", type="primary"):
-            create_new_case(
-                draft["part_number"],
-                draft["revision"],
-                draft["supplier"],
-                draft["qil"],
-                draft["pc_count"],
-                draft["ctf_count"],
-                pc_dims,
-                ctf_dims,
-            )
-            st.session_state.page = "PPAP_WORKSPACE"
-            st.rerun()
-
 # ============================================================================
 # PPAP WORKSPACE PAGE
 # ============================================================================
 
-elif st.session_state.page == "PPAP_WORKSPACE":
+@st.fragment
+def coaching_chat(current_case):
+    """Chat pane for the active document version - sending a message reruns only this"""
+    if not st.session_state.active_chat_context:
+        st.info("👈 Select a document version to start chatting.")
+        return
+
+    chat_case_id, doc_type, version = st.session_state.active_chat_context
+    chat_key = f"{chat_case_id}:{doc_type}:{version}"
+
+    st.markdown(f"""
+    **Context**
+    - Part: `{current_case['part_number']}` Rev `{current_case['revision']}`
+    - Document: **{doc_type}**
+    - Version: **{version}**
+    """)
+
+    if chat_key not in st.session_state.chat_history:
+        st.session_state.chat_history[chat_key] = []
+
+    messages = st.session_state.chat_history[chat_key]
+
+    chat_container = st.container(height=420)
+    with chat_container:
+        visible_key = f"chat_visible:{chat_key}"
+        visible = st.session_state.get(visible_key, CHAT_VISIBLE_MESSAGES)
+        if len(messages) > visible:
+            st.button(
+                "⬆ Load earlier messages",
+                key=f"load_earlier:{chat_key}",
+                on_click=show_earlier_messages,
+                args=(visible_key,)
+            )
+        for msg in messages[-visible:]:
+            with st.chat_message(msg["role"]):
+                st.markdown(msg["content"])
+
+    user_input = st.chat_input(f"Ask about {doc_type} {version}...")
+
+    if user_input:
+        messages.append({"role": "user", "content": user_input})
+
+        ai_response = (
+            f"This response is scoped to **{doc_type} {version}**.\n\n"
+            "Only this document version is considered. "
+            "Other PPAP documents or versions are excluded."
+        )
+
+        messages.append({"role": "assistant", "content": ai_response})
+        del messages[:-CHAT_HISTORY_LIMIT]
+
+        add_activity_log(
+            chat_case_id,
+            "CHAT_INTERACTION",
+            f"Chat on {doc_type} {version}: {user_input[:60]}"
+        )
+
+        # Draw the new exchange in place instead of rerunning the fragment
+        with chat_container:
+            for msg in messages[-2:]:
+                with st.chat_message(msg["role"]):
+                    st.markdown(msg["content"])
+
+def ppap_workspace_page():
+    """Document management, analysis, chat and audit trail for the current case"""
     current_case = get_current_case()
+    case_id = st.session_state.current_case_id
+    case_docs = current_case['documents']
+    doc_versions = document_versions(case_docs)
 
     # Sidebar with case info
     with st.sidebar:
-        try:
-            st.image("assets/images.png", width=150)
-        except:
-            pass  # Image not found, continue without it
-        st.markdown("### 🔒 Internal Use Only")
-        st.caption("Medtronic • Secure Network • Internal LLM")
-        st.divider()
+        logo = load_logo()
+        if logo:
+            st.image(logo, width=150)
+        st.html(INTERNAL_BADGE_HTML + "<hr>")
 
         st.markdown("## PPAP Case Setup")
         st.markdown(f"**Part:** {current_case['part_number']}")
@@ -850,27 +1130,26 @@ elif st.session_state.page == "PPAP_WORKSPACE":
         st.divider()
 
         if st.button("⬅ Back to Case Setup"):
-            st.session_state.page = "CASE_SETUP"
-            st.session_state.current_case_id = None
+            st.session_state.update({"page": "CASE_SETUP", "current_case_id": None})
             st.rerun()
 
     st.title(f"PPAP Review: {current_case['part_number']} Rev {current_case['revision']}")
     st.divider()
 
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-        "📁 Ingestion & Revision",
-        "✅ Checklist & Gaps",
-        "📏 FAIR Review",
-        "⚙️ OQ Review",
-        "📊 PQ Review",
-        "📄 Reports",
-        "💬 PPAP Coaching Chat"
-    ])
+    # st.tabs runs every tab body on every rerun; switch sections with a radio
+    # instead so only the section being viewed is built
+    active_tab = st.radio(
+        "Workspace section",
+        WORKSPACE_TABS,
+        horizontal=True,
+        key="workspace_tab",
+        label_visibility="collapsed"
+    )
 
     # ========================================================================
     # TAB 1: Ingestion & Revision Management
     # ========================================================================
-    with tab1:
+    if active_tab == WORKSPACE_TABS[0]:
         st.header("Document Ingestion & Revision Management")
 
         col1, col2 = st.columns([2, 1])
@@ -878,18 +1157,16 @@ elif st.session_state.page == "PPAP_WORKSPACE":
         with col1:
             st.subheader("Upload Documents")
 
-            doc_type = st.selectbox(
-                "Document Type",
-                ["FAIR", "OQ", "PQ", "Drawing (Ballooned)", "Measurements (Excel/Minitab)"]
-            )
+            doc_type = st.selectbox("Document Type", UPLOAD_DOC_TYPES)
 
-            uploaded_file = st.file_uploader(
+            uploaded_files = st.file_uploader(
                 "Choose file(s)",
                 type=['pdf', 'xlsx', 'xls', 'csv'],
+                accept_multiple_files=True,
                 help="Upload PPAP documentation. System will detect if document already exists and create new version."
             )
 
-            if uploaded_file:
+            if uploaded_files:
                 col_a, col_b = st.columns([3, 1])
                 with col_a:
                     version_notes = st.text_input("Version Notes (optional)", placeholder="e.g., Updated per engineering change notice ECN-1234")
@@ -897,92 +1174,106 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                     if st.button("Upload & Process", type="primary"):
                         # Mock document processing
                         doc_type_key = doc_type.split()[0]  # Extract key part
+                        versions = case_docs[doc_type_key]
+
+                        # The whole batch is versioned and processed in this one run
+                        for uploaded_file in uploaded_files:
+                            version_id = f"v{len(versions) + 1}"
+
+                            versions.append({
+                                'filename': uploaded_file.name,
+                                'version': version_id,
+                                'upload_date': datetime.now(),
+                                'size_kb': uploaded_file.size / 1024,
+                                # Content fingerprint for version-change detection;
+                                # getbuffer() hashes the upload without copying it
+                                'digest': hashlib.blake2b(uploaded_file.getbuffer()).hexdigest(),
+                                'notes': version_notes,
+                                'status': 'Processing...'
+                            })
+
+                            current_case['document_count'] += 1
+                            current_case['latest_version'] = max(current_case['latest_version'], len(versions))
+
+                            add_activity_log(
+                                case_id,
+                                'DOCUMENT_UPLOAD',
+                                f"Uploaded {doc_type} - {uploaded_file.name} ({version_id})"
+                            )
 
-                        version_id = f"v{len(current_case['documents'][doc_type_key]) + 1}"
-
-                        current_case['documents'][doc_type_key].append({
-                            'filename': uploaded_file.name,
-                            'version': version_id,
-                            'upload_date': datetime.now(),
-                            'size_kb': uploaded_file.size / 1024,
-                            'notes': version_notes,
-                            'status': 'Processing...'
-                        })
-
-                        add_activity_log(
-                            st.session_state.current_case_id,
-                            'DOCUMENT_UPLOAD',
-                            f"Uploaded {doc_type} - {uploaded_file.name} ({version_id})"
-                        )
-
-                        st.success(f"✅ Uploaded {uploaded_file.name} as {version_id}")
-                        st.info("🤖 AI processing started... (mocked)")
-
-                        # Mock AI processing complete
-                        current_case['documents'][doc_type_key][-1]['status'] = 'Processed'
-                        add_activity_log(
-                            st.session_state.current_case_id,
-                            'AI_PROCESSING',
-                            f"AI completed analysis of {doc_type} {version_id}"
-                        )
+                            # Mock AI processing complete
+                            versions[-1]['status'] = 'Processed'
+                            add_activity_log(
+                                case_id,
+                                'AI_PROCESSING',
+                                f"AI completed analysis of {doc_type} {version_id}"
+                            )
 
                         st.rerun()
 
         with col2:
             st.subheader("Quick Stats")
-            total_docs = sum(len(docs) for docs in current_case['documents'].values())
-            st.metric("Total Documents", total_docs)
-            st.metric("Latest Version", f"v{max([len(docs) for docs in current_case['documents'].values()], default=0)}")
+            st.metric("Total Documents", current_case['document_count'])
+            st.metric("Latest Version", f"v{current_case['latest_version']}")
 
         st.divider()
 
         # Document version history
         st.subheader("Document Version History")
 
-        for doc_type_key, documents in current_case['documents'].items():
-            if documents:
-                with st.expander(f"📁 {doc_type_key} ({len(documents)} versions)", expanded=True):
-                    # Display each version as a clean card instead of dataframe
-                    for doc in reversed(documents):  # Show newest first
-                        with st.container(border=True):
-                            col1, col2, col3, col4, col5 = st.columns([1, 2, 2, 1, 1])
-                            with col1:
-                                st.markdown(f"**{doc['version']}**")
-                            with col2:
-                                st.markdown(f"📄 {doc['filename']}")
-                            with col3:
-                                st.markdown(f"🕒 {doc['upload_date'].strftime('%Y-%m-%d %H:%M:%S')}")
-                            with col4:
-                                status_emoji = "✅" if doc['status'] == 'Processed' else "⏳"
-                                st.markdown(f"{status_emoji} {doc['status']}")
-                            with col5:
-                                if st.button(
-                                    "💬 Chat",
-                                    key=f"chat_{doc_type_key}_{doc['version']}"
-                                ):
-                                    st.session_state.active_chat_context = (
-                                        st.session_state.current_case_id,
-                                        doc_type_key,
-                                        doc['version']
-                                    )
-                                    st.rerun()
-                            if doc['notes']:
-                                st.caption(f"📝 {doc['notes']}")
-                            st.caption(f"Size: {doc['size_kb']:.2f} KB")
-
-                    if len(documents) > 1:
-                        st.info(f"ℹ️ Version change detection: {documents[-1]['version']} vs {documents[-2]['version']} - [Click to view diff] (mocked)")
+        for doc_type_key, newest_first in doc_versions:
+            with st.expander(f"📁 {doc_type_key} ({len(newest_first)} versions)", expanded=True):
+                shown = newest_first
+                if len(newest_first) > RECENT_VERSIONS and not st.toggle(
+                    f"Show all {len(newest_first)} versions",
+                    key=f"all_versions_{doc_type_key}"
+                ):
+                    shown = newest_first[:RECENT_VERSIONS]
+
+                # Display each version as a clean card instead of dataframe
+                for doc in shown:
+                    with st.container(border=True):
+                        col1, col2, col3, col4, col5 = st.columns([1, 2, 2, 1, 1])
+                        with col1:
+                            st.markdown(f"**{doc['version']}**")
+                        with col2:
+                            st.markdown(f"📄 {doc['filename']}")
+                        with col3:
+                            st.markdown(f"🕒 {doc['upload_date'].isoformat(sep=' ', timespec='seconds')}")
+                        with col4:
+                            status_emoji = "✅" if doc['status'] == 'Processed' else "⏳"
+                            st.markdown(f"{status_emoji} {doc['status']}")
+                        with col5:
+                            st.button(
+                                "💬 Chat",
+                                key=f"chat_{doc_type_key}_{doc['version']}",
+                                on_click=open_chat,
+                                args=((case_id, doc_type_key, doc['version']),)
+                            )
+                        if doc['notes']:
+                            st.caption(f"📝 {doc['notes']}")
+                        st.caption(f"Size: {doc['size_kb']:.2f} KB")
+
+                if len(newest_first) > 1:
+                    latest, previous = newest_first[0], newest_first[1]
+                    if latest['digest'] == previous['digest']:
+                        st.info(f"ℹ️ Version change detection: {latest['version']} is identical to {previous['version']}")
+                    else:
+                        st.info(f"ℹ️ Version change detection: {latest['version']} vs {previous['version']} - [Click to view diff] (mocked)")
 
     # ========================================================================
     # TAB 2: PPAP Checklist & Gap Analysis
     # ========================================================================
-    with tab2:
+    elif active_tab == WORKSPACE_TABS[1]:
         st.header("PPAP Checklist & Gap Analysis")
 
         if st.button("🤖 Generate Checklist with AI", type="primary"):
-            current_case['checklist'] = mock_ai_checklist_generation()
+            current_case['checklist'] = mock_ai_checklist_generation(
+                case_id,
+                tuple((doc_type_key, docs[-1]['version']) for doc_type_key, docs in case_docs.items() if docs)
+            )
             add_activity_log(
-                st.session_state.current_case_id,
+                case_id,
                 'AI_ANALYSIS',
                 'Generated PPAP checklist and gap analysis'
             )
@@ -1008,54 +1299,49 @@ elif st.session_state.page == "PPAP_WORKSPACE":
             # Detailed checklist
             st.subheader("Detailed Requirements")
 
-            df_checklist = pd.DataFrame(checklist['items'])
+            categories = list(dict.fromkeys(item['category'] for item in checklist['items']))
 
             # Filter options
             col1, col2 = st.columns([1, 1])
             with col1:
-                filter_category = st.multiselect("Filter by Category", options=df_checklist['category'].unique(), default=df_checklist['category'].unique())
+                filter_category = st.multiselect("Filter by Category", options=categories, default=categories)
             with col2:
-                filter_status = st.multiselect("Filter by Status", options=['Satisfied', 'Missing'], default=['Satisfied', 'Missing'])
+                filter_status = st.multiselect("Filter by Status", options=CHECKLIST_STATUSES, default=CHECKLIST_STATUSES)
 
-            filtered_df = df_checklist[
-                (df_checklist['category'].isin(filter_category)) &
-                (df_checklist['status'].isin(filter_status))
-            ]
-
-            # Style the dataframe
-            def highlight_status(row):
-                if row['status'] == 'Missing':
-                    return ['background-color: #ffebee'] * len(row)
-                else:
-                    return ['background-color: #e8f5e9'] * len(row)
+            filtered_df, missing_items = checklist_view(checklist['items'], tuple(filter_category), tuple(filter_status))
 
-            styled_df = filtered_df.style.apply(highlight_status, axis=1)
+            if filtered_df.empty:
+                st.info("No requirements match the current filters.")
+            else:
+                # Style the dataframe
+                styled_df = filtered_df.style.apply(highlight_status, axis=None)
 
-            st.dataframe(styled_df, use_container_width=True, hide_index=True)
+                st.dataframe(styled_df, use_container_width=True, hide_index=True)
 
             # Gap summary
             st.divider()
             st.subheader("⚠️ Gaps Requiring Attention")
 
-            missing_items = df_checklist[df_checklist['status'] == 'Missing']
-            for idx, item in missing_items.iterrows():
-                st.warning(f"**{item['category']}:** {item['requirement']}")
+            if missing_items.empty:
+                st.success("✅ No gaps - all requirements are satisfied.")
+            for category, requirement in zip(missing_items['category'].to_numpy(), missing_items['requirement'].to_numpy()):
+                st.warning(f"**{category}:** {requirement}")
         else:
             st.info("Click 'Generate Checklist with AI' to analyze uploaded documents and create PPAP checklist.")
 
     # ========================================================================
     # TAB 3: FAIR Review
     # ========================================================================
-    with tab3:
+    elif active_tab == WORKSPACE_TABS[2]:
         st.header("FAIR (First Article Inspection Report) Review")
 
-        if not current_case['documents']['FAIR']:
+        if not case_docs['FAIR']:
             st.warning("⚠️ No FAIR documents uploaded yet. Please upload a FAIR document in the Ingestion tab.")
         else:
             if st.button("🤖 Analyze FAIR Document", type="primary"):
-                current_case['fair_analysis'] = mock_fair_analysis()
+                current_case['fair_analysis'] = mock_fair_analysis(case_id, case_docs['FAIR'][-1]['version'])
                 add_activity_log(
-                    st.session_state.current_case_id,
+                    case_id,
                     'AI_ANALYSIS',
                     'Completed FAIR document analysis'
                 )
@@ -1090,22 +1376,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 # Dimensional analysis table
                 st.subheader("Dimensional Analysis")
 
-                def highlight_tolerance(row):
-                    colors = []
-                    for col in row.index:
-                        if col == 'Tolerance_Used_%':
-                            val = row[col]
-                            if val > 80:
-                                colors.append('background-color: #ffebee')
-                            elif val > 60:
-                                colors.append('background-color: #fff3e0')
-                            else:
-                                colors.append('background-color: #e8f5e9')
-                        else:
-                            colors.append('')
-                    return colors
-
-                styled_dims = fair['dimensions'].style.apply(highlight_tolerance, axis=1)
+                styled_dims = fair['dimensions'].style.apply(highlight_tolerance, axis=None)
                 st.dataframe(styled_dims, use_container_width=True, hide_index=True)
 
                 st.caption("🟢 Green: <60% tolerance used | 🟡 Orange: 60-80% | 🔴 Red: >80%")
@@ -1127,16 +1398,16 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 4: OQ Review
     # ========================================================================
-    with tab4:
+    elif active_tab == WORKSPACE_TABS[3]:
         st.header("OQ (Operational Qualification) Review")
 
-        if not current_case['documents']['OQ']:
+        if not case_docs['OQ']:
             st.warning("⚠️ No OQ documents uploaded yet. Please upload an OQ document in the Ingestion tab.")
         else:
             if st.button("🤖 Analyze OQ Document", type="primary"):
-                current_case['oq_analysis'] = mock_oq_analysis()
+                current_case['oq_analysis'] = mock_oq_analysis(case_id, case_docs['OQ'][-1]['version'])
                 add_activity_log(
-                    st.session_state.current_case_id,
+                    case_id,
                     'AI_ANALYSIS',
                     'Completed OQ document analysis'
                 )
@@ -1175,10 +1446,9 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 # Process parameters
                 st.subheader("Validated Process Parameters")
 
-                params_df = pd.DataFrame({
-                    'Parameter': list(oq['process_params'].keys()),
-                    'Specification': list(oq['process_params'].values())
-                })
+                params_df = pd.DataFrame.from_records(
+                    list(oq['process_params'].items()), columns=['Parameter', 'Specification']
+                )
 
                 st.dataframe(params_df, use_container_width=True, hide_index=True)
 
@@ -1199,16 +1469,16 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 5: PQ Review
     # ========================================================================
-    with tab5:
+    elif active_tab == WORKSPACE_TABS[4]:
         st.header("PQ (Performance Qualification) Review")
 
-        if not current_case['documents']['PQ']:
+        if not case_docs['PQ']:
             st.warning("⚠️ No PQ documents uploaded yet. Please upload a PQ document in the Ingestion tab.")
         else:
             if st.button("🤖 Analyze PQ Document", type="primary"):
-                current_case['pq_analysis'] = mock_pq_analysis()
+                current_case['pq_analysis'] = mock_pq_analysis(case_id, case_docs['PQ'][-1]['version'])
                 add_activity_log(
-                    st.session_state.current_case_id,
+                    case_id,
                     'AI_ANALYSIS',
                     'Completed PQ document analysis'
                 )
@@ -1236,22 +1506,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 # SPC data
                 st.subheader("Statistical Process Control (SPC) Analysis")
 
-                def highlight_cpk(row):
-                    colors = []
-                    for col in row.index:
-                        if col == 'Cpk':
-                            val = row[col]
-                            if val >= 1.67:
-                                colors.append('background-color: #e8f5e9')
-                            elif val >= 1.33:
-                                colors.append('background-color: #fff3e0')
-                            else:
-                                colors.append('background-color: #ffebee')
-                        else:
-                            colors.append('')
-                    return colors
-
-                styled_spc = pq['spc_data'].style.apply(highlight_cpk, axis=1)
+                styled_spc = pq['spc_data'].style.apply(highlight_cpk, axis=None)
                 st.dataframe(styled_spc, use_container_width=True, hide_index=True)
 
                 st.caption("🟢 Cpk ≥ 1.67: Excellent | 🟡 Cpk ≥ 1.33: Acceptable | 🔴 Cpk < 1.33: Unacceptable")
@@ -1279,7 +1534,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 6: Reports
     # ========================================================================
-    with tab6:
+    elif active_tab == WORKSPACE_TABS[5]:
         st.header("PPAP Summary Reports")
 
         st.markdown("Generate comprehensive PPAP review reports for submission and archival.")
@@ -1309,7 +1564,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 st.markdown(f"**Process:** {current_case['process']}")
                 st.markdown("---")
                 st.markdown("**Document Status:**")
-                for doc_type, docs in current_case['documents'].items():
+                for doc_type, docs in case_docs.items():
                     if docs:
                         st.markdown(f"- {doc_type}: v{len(docs)} uploaded")
                     else:
@@ -1325,7 +1580,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 with st.spinner("Generating PPAP summary report..."):
                     # Mock report generation
                     add_activity_log(
-                        st.session_state.current_case_id,
+                        case_id,
                         'REPORT_GENERATED',
                         f'Generated PPAP summary report ({report_format})'
                     )
@@ -1333,18 +1588,9 @@ elif st.session_state.page == "PPAP_WORKSPACE":
 
         with col2:
             # Mock download button
-            mock_report_content = f"""
-            PPAP Summary Report
-            Part Number: {current_case['part_number']}
-            Revision: {current_case['revision']}
-            Supplier: {current_case['supplier']}
-
-            This is a mock report for demonstration purposes.
-            """
-
             st.download_button(
                 label=f"⬇️ Download {report_format}",
-                data=mock_report_content,
+                data=build_mock_report(current_case['part_number'], current_case['revision'], current_case['supplier']),
                 file_name=f"PPAP_Report_{current_case['part_number']}_{current_case['revision']}.{'pdf' if report_format == 'PDF' else 'docx'}",
                 mime="application/pdf" if report_format == "PDF" else "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                 use_container_width=True
@@ -1369,7 +1615,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 7: PPAP Coaching Chat
     # ========================================================================
-    with tab7:
+    elif active_tab == WORKSPACE_TABS[6]:
         st.header("💬 PPAP Coaching Chat")
 
         # Split layout: left = documents, right = chat
@@ -1381,113 +1627,70 @@ elif st.session_state.page == "PPAP_WORKSPACE":
         with left_col:
             st.subheader("📁 Documents")
 
-            for doc_type_key, documents in current_case['documents'].items():
-                if not documents:
-                    continue
+            active_context = st.session_state.active_chat_context
 
+            for doc_type_key, newest_first in doc_versions:
                 with st.expander(f"{doc_type_key}", expanded=True):
-                    for doc in reversed(documents):
-                        is_active = (
-                            st.session_state.active_chat_context ==
-                            (st.session_state.current_case_id, doc_type_key, doc['version'])
-                        )
+                    for doc in newest_first:
+                        context = (case_id, doc_type_key, doc['version'])
+                        is_active = active_context == context
 
                         button_label = "💬 Active" if is_active else "💬 Chat"
 
-                        if st.button(
+                        st.button(
                             f"{doc['version']} – {doc['filename']}",
                             key=f"chat_select_{doc_type_key}_{doc['version']}",
-                            use_container_width=True
-                        ):
-                            st.session_state.active_chat_context = (
-                                st.session_state.current_case_id,
-                                doc_type_key,
-                                doc['version']
-                            )
-                            st.rerun()
+                            use_container_width=True,
+                            on_click=open_chat,
+                            args=(context,)
+                        )
 
         # --------------------------------------------------
         # RIGHT: Chat Window
         # --------------------------------------------------
         with right_col:
-            if not st.session_state.active_chat_context:
-                st.info("👈 Select a document version to start chatting.")
-                st.stop()
-
-            case_id, doc_type, version = st.session_state.active_chat_context
-            chat_key = f"{case_id}:{doc_type}:{version}"
-
-            st.markdown(f"""
-            **Context**
-            - Part: `{current_case['part_number']}` Rev `{current_case['revision']}`
-            - Document: **{doc_type}**
-            - Version: **{version}**
-            """)
-
-            if chat_key not in st.session_state.chat_history:
-                st.session_state.chat_history[chat_key] = []
-
-            messages = st.session_state.chat_history[chat_key]
-
-            chat_container = st.container(height=420)
-            with chat_container:
-                for msg in messages:
-                    with st.chat_message(msg["role"]):
-                        st.markdown(msg["content"])
-
-            user_input = st.chat_input(f"Ask about {doc_type} {version}...")
-
-            if user_input:
-                messages.append({"role": "user", "content": user_input})
-
-                ai_response = (
-                    f"This response is scoped to **{doc_type} {version}**.\n\n"
-                    "Only this document version is considered. "
-                    "Other PPAP documents or versions are excluded."
-                )
-
-                messages.append({"role": "assistant", "content": ai_response})
-
-                add_activity_log(
-                    case_id,
-                    "CHAT_INTERACTION",
-                    f"Chat on {doc_type} {version}: {user_input[:60]}"
-                )
-
-                st.rerun()
+            coaching_chat(current_case)
 
     # ========================================================================
     # AUDIT TRAIL (shown at bottom of all tabs)
     # ========================================================================
     st.divider()
 
-    with st.expander("📋 Audit Trail / Activity Log", expanded=False):
-        if st.session_state.current_case_id in st.session_state.activity_log and st.session_state.activity_log[st.session_state.current_case_id]:
+    # The log grows with every chat message - only walk it when asked to
+    if st.toggle("📋 Audit Trail / Activity Log", key="show_audit_trail"):
+        if case_id in st.session_state.activity_log and st.session_state.activity_log[case_id]:
             # Display audit log entries in reverse chronological order with clean formatting
-            audit_entries = reversed(st.session_state.activity_log[st.session_state.current_case_id])
+            audit_entries = reversed(st.session_state.activity_log[case_id])
 
             for entry in audit_entries:
-                # Choose icon based on activity type
-                icon_map = {
-                    'CASE_CREATED': '📋',
-                    'DOCUMENT_UPLOAD': '📤',
-                    'AI_PROCESSING': '🤖',
-                    'AI_ANALYSIS': '🔍',
-                    'REPORT_GENERATED': '📄',
-                    'CHAT_INTERACTION': '💬'
-                }
-                icon = icon_map.get(entry['type'], '📌')
-
-                # Format activity type for display
-                activity_display = entry['type'].replace('_', ' ').title()
+                heading = ACTIVITY_HEADINGS.get(entry.type) or f"📌 **{entry.type.replace('_', ' ').title()}**"
+
+                # "YYYY-MM-DD HH:MM:SS" - slice it rather than strftime twice
+                stamp = entry.timestamp.isoformat(sep=' ', timespec='seconds')
 
                 with st.container(border=True):
                     col1, col2 = st.columns([1, 4])
                     with col1:
-                        st.markdown(f"**{entry['timestamp'].strftime('%H:%M:%S')}**")
-                        st.caption(entry['timestamp'].strftime('%Y-%m-%d'))
+                        st.markdown(f"**{stamp[11:]}**")
+                        st.caption(stamp[:10])
                     with col2:
-                        st.markdown(f"{icon} **{activity_display}**")
-                        st.markdown(entry['description'])
+                        st.markdown(heading)
+                        st.markdown(entry.description)
         else:
             st.info("No activity recorded yet for this PPAP case.")
+
+# ============================================================================
+# PAGE ROUTER
+# ============================================================================
+
+PAGES = {
+    **dict.fromkeys(SURVEY_PAGES, survey_page),
+    "CASE_SETUP": case_setup_page,
+    "DIMENSIONS_SETUP": dimensions_setup_page,
+    "PPAP_WORKSPACE": ppap_workspace_page,
+}
+
+# Initialize session state
+init_session_state()
+
+PAGES[st.session_state.page]()
@@ -6,11 +6,15 @@ Scope: FAIR, OQ, PQ workflows for new injection-molded plastic parts only
 Internal use only - Runs on Medtronic secure network with internal LLM
 """
 
+import gc
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+from collections import deque
+from itertools import islice
 from datetime import datetime
-import io
-import random
+from typing import NamedTuple
 
 # Page configuration
 st.set_page_config(
@@ -22,127 +26,273 @@ st.set_page_config(
 
 # Initialize session state
 def init_session_state():
-    """Initialize all session state variables"""
-
-    if "page" not in st.session_state:
-        st.session_state.page = "CASE_SETUP"  # or "PPAP_WORKSPACE"
-
-    if 'ppap_cases' not in st.session_state:
-        st.session_state.ppap_cases = {}
-
-    if 'current_case_id' not in st.session_state:
-        st.session_state.current_case_id = None
-
-    if 'activity_log' not in st.session_state:
-        st.session_state.activity_log = {}
-
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = {}
-    
-    if "active_chat_context" not in st.session_state:
+    """Initialize all session state variables, once per session"""
+    if st.session_state.get("session_initialized"):
+        return
+
+    st.session_state.update({
+        "page": "CASE_SETUP",  # or "PPAP_WORKSPACE"
+        "ppap_cases": {},
+        # Selector label per case id, filled in by create_new_case
+        "case_labels": {},
+        "current_case_id": None,
+        "activity_log": {},
+        "chat_history": {},
         # (case_id, doc_type, version)
-        st.session_state.active_chat_context = None
+        "active_chat_context": None,
+        "session_initialized": True
+    })
 
-def add_activity_log(case_id, activity_type, description):
-    """Add entry to activity log for a PPAP case"""
-    if case_id not in st.session_state.activity_log:
-        st.session_state.activity_log[case_id] = []
+# Only new injection-molded plastic parts are in scope
+CASE_PROCESS = 'Injection Molding - Plastic'
+
+# QIL selector label -> level; QIL 3 & 4 are within project scope
+QIL_OPTIONS = {
+    "1": 1,
+    "2": 2,
+    "3 (In Scope)": 3,
+    "4 (In Scope)": 4,
+    "5": 5,
+    "6": 6,
+    "7": 7,
+}
+
+# Document buckets every case starts with
+DOCUMENT_TYPES = ('FAIR', 'OQ', 'PQ', 'Drawing', 'Measurements')
+
+WORKSPACE_TABS = (
+    "📁 Ingestion & Revision",
+    "✅ Checklist & Gaps",
+    "📏 FAIR Review",
+    "⚙️ OQ Review",
+    "📊 PQ Review",
+    "📄 Reports",
+    "💬 PPAP Coaching Chat"
+)
 
-    st.session_state.activity_log[case_id].append({
-        'timestamp': datetime.now(),
-        'type': activity_type,
-        'description': description
-    })
+# Document versions listed per type before "Show all" is toggled on
+RECENT_VERSIONS = 10
+
+# Chat messages drawn before "Load earlier messages" is clicked
+CHAT_VISIBLE_MESSAGES = 30
+
+# Oldest entries drop off once a case's log reaches this length
+ACTIVITY_LOG_LIMIT = 1000
+
+# Audit trail entries drawn before "Show older entries" is clicked
+AUDIT_VISIBLE_ENTRIES = 50
+
+# Entries kept per case-keyed cache, shared by all sessions; least recently
+# used entries are evicted first so the process can't grow without bound
+CASE_CACHE_ENTRIES = 256
+
+class LogEntry(NamedTuple):
+    """Single activity log entry"""
+    timestamp: datetime
+    type: str
+    description: str
+    # "YYYY-MM-DD HH:MM:SS", formatted once when the entry is logged
+    stamp: str
+
+# Audit trail heading per activity type, formatted once instead of per entry
+ACTIVITY_HEADINGS = {
+    activity_type: f"{icon} **{activity_type.replace('_', ' ').title()}**"
+    for activity_type, icon in {
+        'CASE_CREATED': '📋',
+        'DOCUMENT_UPLOAD': '📤',
+        'AI_PROCESSING': '🤖',
+        'AI_ANALYSIS': '🔍',
+        'REPORT_GENERATED': '📄',
+        'CHAT_INTERACTION': '💬'
+    }.items()
+}
+
+def add_activity_log(case_id, activity_type, description, *, ts=None):
+    """Add entry to activity log for a PPAP case (log is created with the case)"""
+    ts = ts or datetime.now()
+    st.session_state.activity_log[case_id].append(
+        LogEntry(ts, activity_type, description, ts.isoformat(' ', 'seconds'))
+    )
+
+def document_status_md(documents):
+    """Report preview list of the latest version uploaded per document type"""
+    return "\n".join(
+        f"- {doc_type}: v{len(docs)} uploaded" if docs else f"- {doc_type}: Not uploaded"
+        for doc_type, docs in documents.items()
+    )
 
 def create_new_case(part_number, revision, supplier, qil, pc, ctf):
     """Create a new PPAP case"""
-    case_id = f"{part_number}_{revision}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    now = datetime.now()
+    case_id = f"{part_number}_{revision}_{now.isoformat('_', 'seconds').replace('-', '').replace(':', '')}"
+    documents = {doc_type: [] for doc_type in DOCUMENT_TYPES}
 
     st.session_state.ppap_cases[case_id] = {
         'part_number': part_number,
         'revision': revision,
         'supplier': supplier,
-        'process': 'Injection Molding - Plastic',
+        'process': CASE_PROCESS,
         'qil': qil,
         'pc': pc,
         'ctf': ctf,
-        'created_date': datetime.now(),
-        'documents': {
-            'FAIR': [],
-            'OQ': [],
-            'PQ': [],
-            'Drawing': [],
-            'Measurements': []
-        },
+        'created_date': now,
+        'created_display': now.isoformat(' ', 'minutes'),
+        # Case metadata never changes, so the sidebar block is formatted once
+        'sidebar_md': (
+            f"**Part:** {part_number}\n\n"
+            f"**Revision:** {revision}\n\n"
+            f"**Supplier:** {supplier}\n\n"
+            f"**Process:** {CASE_PROCESS}"
+        ),
+        'documents': documents,
+        # Rebuilt on upload so the report preview is a single markdown element
+        'document_status_md': document_status_md(documents),
+        # Maintained on upload so the Quick Stats metrics don't rescan every bucket
+        'document_count': 0,
+        'latest_version': 0,
         'checklist': None,
         'fair_analysis': None,
         'oq_analysis': None,
         'pq_analysis': None
     }
 
+    st.session_state.case_labels[case_id] = f"{part_number} Rev {revision}"
+    st.session_state.activity_log[case_id] = deque(maxlen=ACTIVITY_LOG_LIMIT)
+
     st.session_state.current_case_id = case_id
-    add_activity_log(case_id, 'CASE_CREATED', f'PPAP case created for {part_number} Rev {revision}')
+    add_activity_log(case_id, 'CASE_CREATED', f'PPAP case created for {part_number} Rev {revision}', ts=now)
 
     return case_id
 
 def get_current_case():
     """Get the currently selected PPAP case"""
-    if st.session_state.current_case_id:
-        return st.session_state.ppap_cases.get(st.session_state.current_case_id)
-    return None
+    case_id = st.session_state.current_case_id
+    return st.session_state.ppap_cases[case_id] if case_id else None
+
+def submit_new_case():
+    """New case form callback - create the case and open its workspace before anything renders"""
+    part_number = st.session_state.new_case_part_number
+    revision = st.session_state.new_case_revision
+    supplier = st.session_state.new_case_supplier
+    if part_number and revision and supplier:
+        st.session_state.last_created_case = create_new_case(
+            part_number,
+            revision,
+            supplier,
+            QIL_OPTIONS[st.session_state.new_case_qil],
+            st.session_state.new_case_pc,
+            st.session_state.new_case_ctf
+        )
+        st.session_state.page = "PPAP_WORKSPACE"
+
+# Mock analysis tables are constant - build them once per process instead of
+# on every script rerun. Measurements are float32 and repeated labels are
+# categorical / dictionary encoded to keep the Arrow payload small
+
+@st.cache_resource(show_spinner=False)
+def _fair_dims_df():
+    """Mock FAIR dimensional table"""
+    return pd.DataFrame({
+        'Balloon_ID': ['1', '2', '3', '4', '5', '6', '7', '8'],
+        'Dimension': ['Overall Length', 'Inner Diameter', 'Wall Thickness', 'Boss Height', 'Hole Diameter', 'Surface Finish', 'Thread Depth', 'Concentricity'],
+        'Nominal': [125.0, 25.4, 2.5, 8.0, 6.35, 0.8, 5.0, 0.05],
+        'USL': [125.5, 25.6, 2.6, 8.2, 6.40, 1.2, 5.2, 0.10],
+        'LSL': [124.5, 25.2, 2.4, 7.8, 6.30, 0.4, 4.8, 0.00],
+        'Measured': [125.1, 25.42, 2.51, 8.05, 6.36, 0.75, 5.03, 0.03],
+        'Tolerance_Used_%': [20, 40, 20, 25, 20, 37.5, 15, 30],
+        'Status': ['Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass']
+    }).astype({
+        'Balloon_ID': 'category',
+        'Nominal': 'float32',
+        'USL': 'float32',
+        'LSL': 'float32',
+        'Measured': 'float32',
+        'Tolerance_Used_%': 'float32',
+        'Status': 'category'
+    })
+
+@st.cache_resource(show_spinner=False)
+def _oq_equipment_table():
+    """Mock OQ equipment table, kept in Arrow since it is shown unstyled"""
+    return pa.table({
+        'Equipment': ['Injection Molding Machine', 'Temperature Controller', 'Mold Assembly', 'Material Dryer'],
+        'Model': ['Engel Victory 200', 'Mold-Masters Summit', 'Custom Mold #8891', 'Motan Luxor'],
+        'Serial_Number': ['ENG-200-4478', 'MM-SUM-9921', 'MM-8891', 'MLX-3344'],
+        'Calibration_Status': ['Valid until 06/2026', 'Valid until 08/2026', 'N/A', 'Valid until 12/2025'],
+        'Status': pa.array(['Qualified', 'Qualified', 'Qualified', 'Qualified']).dictionary_encode()
+    })
+
+@st.cache_resource(show_spinner=False)
+def _pq_spc_df():
+    """Mock PQ SPC table"""
+    return pd.DataFrame({
+        'Parameter': ['Overall Length', 'Inner Diameter', 'Wall Thickness', 'Boss Height'],
+        'Mean': [125.08, 25.41, 2.502, 8.03],
+        'StdDev': [0.08, 0.06, 0.015, 0.04],
+        'Cp': [2.08, 1.67, 2.22, 2.50],
+        'Cpk': [1.87, 1.50, 1.93, 2.25],
+        'Status': ['Pass (Cpk>1.33)', 'Pass (Cpk>1.33)', 'Pass (Cpk>1.33)', 'Pass (Cpk>1.33)']
+    }).astype({
+        'Mean': 'float32',
+        'StdDev': 'float32',
+        'Cp': 'float32',
+        'Cpk': 'float32',
+        'Status': 'category'
+    })
 
+@st.cache_resource(show_spinner=False)
+def _checklist_df():
+    """Mock checklist items, one column per field"""
+    return pd.DataFrame({
+        'category': ['FAIR', 'FAIR', 'FAIR', 'OQ', 'OQ', 'OQ', 'PQ', 'PQ', 'Drawing', 'Measurements'],
+        'requirement': [
+            'Part dimensional report with all critical dimensions',
+            'Material certification and compliance',
+            'Process capability study (Cpk ≥ 1.33)',
+            'Equipment qualification documentation',
+            'Process parameter validation',
+            'Maintenance and calibration records',
+            'Production run data (30+ consecutive units)',
+            'Statistical process control charts',
+            'Ballooned engineering drawing with GD&T',
+            'Complete measurement data for all dimensions'
+        ],
+        'status': ['Satisfied', 'Satisfied', 'Missing', 'Satisfied', 'Satisfied', 'Missing', 'Satisfied', 'Missing', 'Satisfied', 'Satisfied'],
+        'evidence': ['FAIR_v2.pdf', 'FAIR_v2.pdf', None, 'OQ_v1.pdf', 'OQ_v1.pdf', None, 'PQ_v1.pdf', None, 'Drawing_v3.pdf', 'Measurements_v2.xlsx']
+    }).astype({'category': 'category', 'status': 'category'})
+
+@st.cache_data(show_spinner=False)
 def mock_ai_checklist_generation():
     """Mock AI-generated PPAP checklist"""
     return {
         'total_items': 24,
         'satisfied': 18,
         'missing': 6,
-        'items': [
-            {'category': 'FAIR', 'requirement': 'Part dimensional report with all critical dimensions', 'status': 'Satisfied', 'evidence': 'FAIR_v2.pdf'},
-            {'category': 'FAIR', 'requirement': 'Material certification and compliance', 'status': 'Satisfied', 'evidence': 'FAIR_v2.pdf'},
-            {'category': 'FAIR', 'requirement': 'Process capability study (Cpk ≥ 1.33)', 'status': 'Missing', 'evidence': None},
-            {'category': 'OQ', 'requirement': 'Equipment qualification documentation', 'status': 'Satisfied', 'evidence': 'OQ_v1.pdf'},
-            {'category': 'OQ', 'requirement': 'Process parameter validation', 'status': 'Satisfied', 'evidence': 'OQ_v1.pdf'},
-            {'category': 'OQ', 'requirement': 'Maintenance and calibration records', 'status': 'Missing', 'evidence': None},
-            {'category': 'PQ', 'requirement': 'Production run data (30+ consecutive units)', 'status': 'Satisfied', 'evidence': 'PQ_v1.pdf'},
-            {'category': 'PQ', 'requirement': 'Statistical process control charts', 'status': 'Missing', 'evidence': None},
-            {'category': 'Drawing', 'requirement': 'Ballooned engineering drawing with GD&T', 'status': 'Satisfied', 'evidence': 'Drawing_v3.pdf'},
-            {'category': 'Measurements', 'requirement': 'Complete measurement data for all dimensions', 'status': 'Satisfied', 'evidence': 'Measurements_v2.xlsx'}
-        ]
+        'items': _checklist_df()
     }
 
-def mock_fair_analysis():
-    """Mock FAIR document analysis results"""
+@st.cache_data(show_spinner="Analyzing...", ttl=60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def mock_fair_analysis(case_id, version):
+    """Mock FAIR document analysis results, cached per case and FAIR version"""
+    dimensions = _fair_dims_df()
     return {
         'dimensions_extracted': 47,
         'critical_dimensions': 12,
-        'dimensions': pd.DataFrame({
-            'Balloon_ID': ['1', '2', '3', '4', '5', '6', '7', '8'],
-            'Dimension': ['Overall Length', 'Inner Diameter', 'Wall Thickness', 'Boss Height', 'Hole Diameter', 'Surface Finish', 'Thread Depth', 'Concentricity'],
-            'Nominal': [125.0, 25.4, 2.5, 8.0, 6.35, 0.8, 5.0, 0.05],
-            'USL': [125.5, 25.6, 2.6, 8.2, 6.40, 1.2, 5.2, 0.10],
-            'LSL': [124.5, 25.2, 2.4, 7.8, 6.30, 0.4, 4.8, 0.00],
-            'Measured': [125.1, 25.42, 2.51, 8.05, 6.36, 0.75, 5.03, 0.03],
-            'Tolerance_Used_%': [20, 40, 20, 25, 20, 37.5, 15, 30],
-            'Status': ['Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass']
-        }),
+        'dimensions': dimensions,
+        # Counted once here rather than rescanning the table on every rerun
+        'passing_summary': f"{int((dimensions['Status'] == 'Pass').sum())}/{len(dimensions)}",
         'material': 'Polycarbonate (PC) - Medical Grade',
         'supplier_cert': 'ISO 13485 Certified',
         'traceability': 'Lot# PCM-2024-8891'
     }
 
-def mock_oq_analysis():
-    """Mock OQ document analysis results"""
+@st.cache_data(show_spinner="Analyzing...", ttl=60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def mock_oq_analysis(case_id, version):
+    """Mock OQ document analysis results, cached per case and OQ version"""
     return {
         'sections_found': ['Equipment List', 'Process Parameters', 'Qualification Protocol', 'Test Results'],
         'sections_missing': ['Maintenance Schedule', 'Calibration Certificates'],
-        'equipment': pd.DataFrame({
-            'Equipment': ['Injection Molding Machine', 'Temperature Controller', 'Mold Assembly', 'Material Dryer'],
-            'Model': ['Engel Victory 200', 'Mold-Masters Summit', 'Custom Mold #8891', 'Motan Luxor'],
-            'Serial_Number': ['ENG-200-4478', 'MM-SUM-9921', 'MM-8891', 'MLX-3344'],
-            'Calibration_Status': ['Valid until 06/2026', 'Valid until 08/2026', 'N/A', 'Valid until 12/2025'],
-            'Status': ['Qualified', 'Qualified', 'Qualified', 'Qualified']
-        }),
+        'equipment': _oq_equipment_table(),
         'process_params': {
             'Injection Pressure': '1200 bar ± 50',
             'Melt Temperature': '280°C ± 5°C',
@@ -153,49 +303,295 @@ def mock_oq_analysis():
         'validation_status': 'Partially Complete'
     }
 
-def mock_pq_analysis():
-    """Mock PQ document analysis results"""
+@st.cache_data(show_spinner="Analyzing...", ttl=60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def mock_pq_analysis(case_id, version):
+    """Mock PQ document analysis results, cached per case and PQ version"""
     return {
         'production_run_size': 50,
         'required_run_size': 30,
         'run_status': 'Sufficient',
-        'spc_data': pd.DataFrame({
-            'Parameter': ['Overall Length', 'Inner Diameter', 'Wall Thickness', 'Boss Height'],
-            'Mean': [125.08, 25.41, 2.502, 8.03],
-            'StdDev': [0.08, 0.06, 0.015, 0.04],
-            'Cp': [2.08, 1.67, 2.22, 2.50],
-            'Cpk': [1.87, 1.50, 1.93, 2.25],
-            'Status': ['Pass (Cpk>1.33)', 'Pass (Cpk>1.33)', 'Pass (Cpk>1.33)', 'Pass (Cpk>1.33)']
-        }),
+        'spc_data': _pq_spc_df(),
         'defect_rate': '0.02% (1 reject in 50 parts)',
         'first_pass_yield': '98%',
         'validation_notes': 'Production process demonstrated adequate capability for all critical dimensions.'
     }
 
+@st.cache_data(show_spinner=False, ttl=60 * 60, max_entries=CASE_CACHE_ENTRIES)
+def build_mock_report(part_number, revision, supplier):
+    """Mock PPAP summary report bytes, built once per case header"""
+    return f"""
+PPAP Summary Report
+Part Number: {part_number}
+Revision: {revision}
+Supplier: {supplier}
+
+This is a mock report for demonstration purposes.
+""".encode()
+
+def open_selected_case(option_ids):
+    """Case selector callback - open the picked case before anything renders"""
+    selected_case = option_ids[st.session_state.case_select]
+    if selected_case != "Create New Case":
+        st.session_state.current_case_id = selected_case
+        st.session_state.page = "PPAP_WORKSPACE"
+
+def close_case():
+    """Back button callback - leave the workspace for case setup"""
+    st.session_state.page = "CASE_SETUP"
+    st.session_state.current_case_id = None
+
+def upload_document(case_id):
+    """Upload button callback - store the file as the next version of its type"""
+    current_case = st.session_state.ppap_cases[case_id]
+    doc_type = st.session_state.upload_doc_type
+    uploaded_file = st.session_state.upload_file
+
+    # Mock document processing
+    doc_type_key = doc_type.split()[0]  # Extract key part
+
+    versions = current_case['documents'][doc_type_key]
+    version_id = f"v{len(versions) + 1}"
+
+    now = datetime.now()
+    versions.append({
+        'filename': uploaded_file.name,
+        'version': version_id,
+        'upload_date': now,
+        'upload_display': now.isoformat(' ', 'seconds'),
+        'size_kb': uploaded_file.size / 1024,
+        'size_display': f"{uploaded_file.size / 1024:.2f} KB",
+        'notes': st.session_state.upload_notes,
+        'status': 'Processing...'
+    })
+
+    current_case['document_count'] += 1
+    current_case['latest_version'] = max(current_case['latest_version'], len(versions))
+    current_case['document_status_md'] = document_status_md(current_case['documents'])
+
+    add_activity_log(
+        case_id,
+        'DOCUMENT_UPLOAD',
+        f"Uploaded {doc_type} - {uploaded_file.name} ({version_id})",
+        ts=now
+    )
+
+    # Mock AI processing complete
+    versions[-1]['status'] = 'Processed'
+    add_activity_log(
+        case_id,
+        'AI_PROCESSING',
+        f"AI completed analysis of {doc_type} {version_id}",
+        ts=now
+    )
+
+    st.session_state.last_upload = f"Uploaded {uploaded_file.name} as {version_id}"
+
+def generate_checklist(case_id):
+    """Generate Checklist button callback"""
+    st.session_state.ppap_cases[case_id]['checklist'] = mock_ai_checklist_generation()
+    add_activity_log(
+        case_id,
+        'AI_ANALYSIS',
+        'Generated PPAP checklist and gap analysis'
+    )
+
+def analyze_document(case_id, doc_type, analyzer):
+    """Analyze button callback - run analyzer on the latest version of doc_type"""
+    current_case = st.session_state.ppap_cases[case_id]
+    current_case[f"{doc_type.lower()}_analysis"] = analyzer(case_id, current_case['documents'][doc_type][-1]['version'])
+    add_activity_log(
+        case_id,
+        'AI_ANALYSIS',
+        f'Completed {doc_type} document analysis'
+    )
+
+def open_chat(context):
+    """Chat button callback - focus the coaching chat on a (case, type, version)"""
+    st.session_state.active_chat_context = context
+    st.session_state.workspace_tab = WORKSPACE_TABS[-1]
+
+def show_more(visible_key, default):
+    """"Load earlier" / "Show older" callback - double the rendered window"""
+    st.session_state[visible_key] = st.session_state.get(visible_key, default) * 2
+
+def visible_versions(documents, toggle_key):
+    """Versions newest first, cut to RECENT_VERSIONS unless the Show all toggle is on"""
+    if len(documents) > RECENT_VERSIONS and not st.toggle(f"Show all {len(documents)} versions", key=toggle_key):
+        return documents[-RECENT_VERSIONS:][::-1]
+    return documents[::-1]
+
+def version_history_md(versions):
+    """Markdown table with one row per document version"""
+    rows = [
+        f"| **{doc['version']}** | 📄 {escape_table_cell(doc['filename'])} | 🕒 {doc['upload_display']} "
+        f"| {'✅' if doc['status'] == 'Processed' else '⏳'} {doc['status']} "
+        f"| {escape_table_cell(doc['notes'])} | {doc['size_display']} |"
+        for doc in versions
+    ]
+    return "\n".join(("| Version | File | Uploaded | Status | Notes | Size |", "|---|---|---|---|---|---|", *rows))
+
+def escape_table_cell(text):
+    """Keep user-entered text from breaking out of a markdown table cell"""
+    return text.replace("|", "\\|")
+
+@st.cache_data(show_spinner=False)
+def checklist_view(items, categories, statuses):
+    """Checklist rows matching the category/status filters, plus all missing rows"""
+    status = items['status'].to_numpy()
+    mask = np.isin(items['category'].to_numpy(), categories) & np.isin(status, statuses)
+    return items.iloc[mask], items.iloc[status == 'Missing']
+
+@st.cache_data(show_spinner=False)
+def process_params_df(params):
+    """OQ process parameter table from (parameter, specification) pairs"""
+    return pd.DataFrame.from_records(params, columns=['Parameter', 'Specification'])
+
 def render_dimension_grid(prefix, count, step=0.01):
     """
-    Renders numeric inputs in a 3-column grid.
-    Returns a list of entered values.
+    Renders one editable table with a row per dimension.
+    Returns the entered values as a float32 array.
     """
-    values = []
-
-    for i in range(0, count, 3):
-        cols = st.columns(3)
-        for j in range(3):
-            idx = i + j
-            if idx < count:
-                with cols[j]:
-                    val = st.number_input(
-                        f"{prefix} Dimension {idx + 1}",
-                        key=f"{prefix.lower()}_dim_{idx}",
-                        step=step
-                    )
-                    values.append(val)
+    table = st.data_editor(
+        pd.DataFrame({
+            "Dimension": [f"{prefix} Dimension {idx + 1}" for idx in range(count)],
+            "Value": np.zeros(count, dtype=np.float32),
+        }),
+        key=f"{prefix.lower()}_dims",
+        column_config={"Value": st.column_config.NumberColumn(step=step)},
+        disabled=["Dimension"],
+        hide_index=True,
+        use_container_width=True
+    )
+
+    return table["Value"].to_numpy(dtype=np.float32)
+
+# Table stylers for Styler.apply(axis=None) - one vectorized pass per table
+# instead of a Python call per row
+
+def highlight_status(df):
+    """Checklist rows: red for missing requirements, green otherwise"""
+    colors = np.where(df['status'].to_numpy() == 'Missing', 'background-color: #ffebee', 'background-color: #e8f5e9')
+    return pd.DataFrame(np.repeat(colors[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
+
+def highlight_tolerance(df):
+    """FAIR dimensions: colour tolerance used, red >80%, orange >60%, else green"""
+    used = df['Tolerance_Used_%'].to_numpy()
+    styles = pd.DataFrame('', index=df.index, columns=df.columns)
+    styles['Tolerance_Used_%'] = np.select(
+        [used > 80, used > 60],
+        ['background-color: #ffebee', 'background-color: #fff3e0'],
+        'background-color: #e8f5e9'
+    )
+    return styles
+
+def highlight_cpk(df):
+    """PQ SPC data: colour Cpk, green >=1.67, orange >=1.33, else red"""
+    cpk = df['Cpk'].to_numpy()
+    styles = pd.DataFrame('', index=df.index, columns=df.columns)
+    styles['Cpk'] = np.select(
+        [cpk >= 1.67, cpk >= 1.33],
+        ['background-color: #e8f5e9', 'background-color: #fff3e0'],
+        'background-color: #ffebee'
+    )
+    return styles
+
+# Tables longer than this are cut down before they are sent to the browser
+MAX_DISPLAY_ROWS = 500
+
+def safe_display(table, name, style=None, column_config=None, max_rows=MAX_DISPLAY_ROWS):
+    """
+    Renders a table with st.dataframe, showing at most max_rows rows.
+    Longer tables get a warning and a CSV download of the full data instead.
+    style is an optional table-wise Styler function applied to the shown rows,
+    column_config is passed through so number formats are applied in the browser.
+    """
+    if len(table) > max_rows:
+        if isinstance(table, pa.Table):
+            table = table.to_pandas()
+        st.warning(f"Showing first {max_rows} of {len(table)} rows")
+        st.download_button(
+            "⬇️ Download full CSV",
+            table.to_csv(index=False),
+            file_name=f"{name}.csv",
+            mime="text/csv",
+            key=f"download_{name}"
+        )
+        table = table.head(max_rows)
+
+    if style:
+        table = table.style.apply(style, axis=None)
+    st.dataframe(table, use_container_width=True, hide_index=True, column_config=column_config)
+
+@st.fragment
+def coaching_chat(current_case):
+    """Chat pane for the active document version - sending a message reruns only this"""
+    if not st.session_state.active_chat_context:
+        st.info("👈 Select a document version to start chatting.")
+        return
+
+    chat_case_id, doc_type, version = st.session_state.active_chat_context
+    chat_key = f"{chat_case_id}:{doc_type}:{version}"
+
+    st.markdown(f"""
+    **Context**
+    - Part: `{current_case['part_number']}` Rev `{current_case['revision']}`
+    - Document: **{doc_type}**
+    - Version: **{version}**
+    """)
+
+    messages = st.session_state.chat_history.setdefault(chat_key, [])
+
+    # Every run has to redraw what it shows, so only the newest messages are
+    # drawn until the user asks for earlier ones
+    chat_container = st.container(height=420)
+    with chat_container:
+        visible_key = f"chat_visible:{chat_key}"
+        visible = st.session_state.get(visible_key, CHAT_VISIBLE_MESSAGES)
+        if len(messages) > visible:
+            st.button(
+                "⬆ Load earlier messages",
+                key=f"load_earlier:{chat_key}",
+                on_click=show_more,
+                args=(visible_key, CHAT_VISIBLE_MESSAGES)
+            )
+        for msg in messages[-visible:]:
+            with st.chat_message(msg["role"]):
+                st.markdown(msg["content"])
+
+    user_input = st.chat_input(f"Ask about {doc_type} {version}...")
+
+    if user_input:
+        messages.append({"role": "user", "content": user_input})
+
+        ai_response = (
+            f"This response is scoped to **{doc_type} {version}**.\n\n"
+            "Only this document version is considered. "
+            "Other PPAP documents or versions are excluded."
+        )
+
+        messages.append({"role": "assistant", "content": ai_response})
 
-    return values
+        add_activity_log(
+            chat_case_id,
+            "CHAT_INTERACTION",
+            f"Chat on {doc_type} {version}: {user_input[:60]}"
+        )
 
+        # Draw the new exchange in place instead of rerunning the fragment
+        with chat_container:
+            for msg in messages[-2:]:
+                with st.chat_message(msg["role"]):
+                    st.markdown(msg["content"])
+
+
+@st.cache_resource(show_spinner=False)
+def freeze_startup_heap():
+    """Move the import-time heap out of the collector's reach, once per process"""
+    gc.collect()
+    gc.freeze()
 
 # Initialize session state
+freeze_startup_heap()
 init_session_state()
 
 # ============================================================================
@@ -335,55 +731,45 @@ if st.session_state.page == "CASE_SETUP":
             # Select existing case
             # -------------------------
             if len(st.session_state.ppap_cases) > 0:
-                case_options = {
-                    case_id: f"{case['part_number']} Rev {case['revision']}"
-                    for case_id, case in st.session_state.ppap_cases.items()
-                }
+                # Parallel id / label columns; the selectbox picks an index into both
+                case_labels = st.session_state.case_labels
+                option_ids = ("Create New Case", *case_labels)
+                labels = ("Create New Case", *case_labels.values())
 
-                selected_case = st.selectbox(
+                st.selectbox(
                     "Select PPAP Case",
-                    options=["Create New Case"] + list(case_options.keys()),
-                    format_func=lambda x: x if x == "Create New Case" else case_options[x]
+                    options=range(len(option_ids)),
+                    format_func=labels.__getitem__,
+                    key="case_select",
+                    on_change=open_selected_case,
+                    args=(option_ids,)
                 )
 
-                if selected_case != "Create New Case":
-                    st.session_state.current_case_id = selected_case
-                    st.session_state.page = "PPAP_WORKSPACE"
-                    st.rerun()
+                # Returning users mostly open an existing case, so the form is
+                # only built when asked for
+                show_new_case_form = st.toggle("＋ New case", key="show_new_case_form")
             else:
-                selected_case = "Create New Case"
+                show_new_case_form = True
 
             # -------------------------
             # Create new case
             # -------------------------
-            if selected_case == "Create New Case":
+            if show_new_case_form:
                 st.subheader("Create New PPAP Case")
 
                 with st.form("new_case_form"):
-                    part_number = st.text_input("Part Number")
-                    revision = st.text_input("Revision")
-                    supplier = st.text_input("Supplier")
-
-                    qil = st.selectbox("QIL", [1, 2, 3, 4, 5, 6, 7])
-                    pc_count = st.number_input("PC (Number of Dimensions)", min_value=0, step=1)
-                    ctf_count = st.number_input("CTF (Number of Dimensions)", min_value=0, step=1)
-
-                    submitted = st.form_submit_button("Create Case")
-
-                    if submitted:
-                        if part_number and revision and supplier:
-                            create_new_case(
-                                part_number,
-                                revision,
-                                supplier,
-                                qil,
-                                pc_count,
-                                ctf_count
-                            )
-                            st.session_state.page = "PPAP_WORKSPACE"
-                            st.rerun()
-                        else:
-                            st.error("Please fill all required fields")
+                    st.text_input("Part Number", key="new_case_part_number")
+                    st.text_input("Revision", key="new_case_revision")
+                    st.text_input("Supplier", key="new_case_supplier")
+
+                    st.selectbox("QIL", QIL_OPTIONS, key="new_case_qil", help="QIL 3 & 4 are within project scope")
+                    st.number_input("PC (Number of Dimensions)", min_value=0, step=1, key="new_case_pc")
+                    st.number_input("CTF (Number of Dimensions)", min_value=0, step=1, key="new_case_ctf")
+
+                    # A valid submission is handled by the callback, which has
+                    # already switched to the workspace by the time this runs
+                    if st.form_submit_button("Create Case", on_click=submit_new_case):
+                        st.error("Please fill all required fields")
 
 
 elif st.session_state.page == "PPAP_WORKSPACE":
@@ -393,43 +779,42 @@ elif st.session_state.page == "PPAP_WORKSPACE":
         st.caption("Medtronic • Secure Network • Internal LLM")
         st.divider()
 
+        case_id = st.session_state.current_case_id
         current_case = get_current_case()
 
         st.markdown("## PPAP Case Setup")
-        st.markdown(f"**Part:** {current_case['part_number']}")
-        st.markdown(f"**Revision:** {current_case['revision']}")
-        st.markdown(f"**Supplier:** {current_case['supplier']}")
-        st.markdown(f"**Process:** {current_case['process']}")
+        st.markdown(current_case['sidebar_md'])
 
         col1, col2, col3 = st.columns(3)
         col1.metric("QIL", current_case['qil'])
         col2.metric("PC", current_case['pc'])
         col3.metric("CTF", current_case['ctf'])
 
+        st.caption(f"Created: {current_case['created_display']}")
+
         st.divider()
 
-        if st.button("⬅ Back to Case Setup"):
-            st.session_state.page = "CASE_SETUP"
-            st.session_state.current_case_id = None
-            st.rerun()
+        st.button("⬅ Back to Case Setup", on_click=close_case)
         
     st.title(f"PPAP Review: {current_case['part_number']} Rev {current_case['revision']}")
+    if "last_created_case" in st.session_state:
+        st.success(f"Created case: {st.session_state.pop('last_created_case')}")
     st.divider()
 
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-        "📁 Ingestion & Revision",
-        "✅ Checklist & Gaps",
-        "📏 FAIR Review",
-        "⚙️ OQ Review",
-        "📊 PQ Review",
-        "📄 Reports",
-        "💬 PPAP Coaching Chat"
-    ])
+    # st.tabs runs every tab body on every rerun; switch sections with a radio
+    # instead so only the section being viewed is built
+    active_tab = st.radio(
+        "Workspace section",
+        WORKSPACE_TABS,
+        horizontal=True,
+        key="workspace_tab",
+        label_visibility="collapsed"
+    )
 
     # ========================================================================
     # TAB 1: Ingestion & Revision Management
     # ========================================================================
-    with tab1:
+    if active_tab == WORKSPACE_TABS[0]:
         st.header("Document Ingestion & Revision Management")
 
         col1, col2 = st.columns([2, 1])
@@ -437,97 +822,60 @@ elif st.session_state.page == "PPAP_WORKSPACE":
         with col1:
             st.subheader("Upload Documents")
 
-            doc_type = st.selectbox(
+            st.selectbox(
                 "Document Type",
-                ["FAIR", "OQ", "PQ", "Drawing (Ballooned)", "Measurements (Excel/Minitab)"]
+                ["FAIR", "OQ", "PQ", "Drawing (Ballooned)", "Measurements (Excel/Minitab)"],
+                key="upload_doc_type"
             )
 
             uploaded_file = st.file_uploader(
                 "Choose file(s)",
                 type=['pdf', 'xlsx', 'xls', 'csv'],
-                help="Upload PPAP documentation. System will detect if document already exists and create new version."
+                help="Upload PPAP documentation. System will detect if document already exists and create new version.",
+                key="upload_file"
             )
 
             if uploaded_file:
                 col_a, col_b = st.columns([3, 1])
                 with col_a:
-                    version_notes = st.text_input("Version Notes (optional)", placeholder="e.g., Updated per engineering change notice ECN-1234")
+                    st.text_input("Version Notes (optional)", placeholder="e.g., Updated per engineering change notice ECN-1234", key="upload_notes")
                 with col_b:
-                    if st.button("Upload & Process", type="primary"):
-                        # Mock document processing
-                        doc_type_key = doc_type.split()[0]  # Extract key part
-
-                        version_id = f"v{len(current_case['documents'][doc_type_key]) + 1}"
-
-                        current_case['documents'][doc_type_key].append({
-                            'filename': uploaded_file.name,
-                            'version': version_id,
-                            'upload_date': datetime.now(),
-                            'size_kb': uploaded_file.size / 1024,
-                            'notes': version_notes,
-                            'status': 'Processing...'
-                        })
-
-                        add_activity_log(
-                            st.session_state.current_case_id,
-                            'DOCUMENT_UPLOAD',
-                            f"Uploaded {doc_type} - {uploaded_file.name} ({version_id})"
-                        )
+                    st.button("Upload & Process", type="primary", on_click=upload_document, args=(case_id,))
 
-                        st.success(f"✅ Uploaded {uploaded_file.name} as {version_id}")
-                        st.info("🤖 AI processing started... (mocked)")
-
-                        # Mock AI processing complete
-                        current_case['documents'][doc_type_key][-1]['status'] = 'Processed'
-                        add_activity_log(
-                            st.session_state.current_case_id,
-                            'AI_PROCESSING',
-                            f"AI completed analysis of {doc_type} {version_id}"
-                        )
-
-                        st.rerun()
+            if "last_upload" in st.session_state:
+                st.success(f"✅ {st.session_state.pop('last_upload')}")
 
         with col2:
             st.subheader("Quick Stats")
-            total_docs = sum(len(docs) for docs in current_case['documents'].values())
-            st.metric("Total Documents", total_docs)
-            st.metric("Latest Version", f"v{max([len(docs) for docs in current_case['documents'].values()], default=0)}")
-
-        st.divider()
+            st.metric("Total Documents", current_case['document_count'])
+            st.metric("Latest Version", f"v{current_case['latest_version']}")
 
         # Document version history
-        st.subheader("Document Version History")
+        st.markdown("---\n### Document Version History")
 
         for doc_type_key, documents in current_case['documents'].items():
             if documents:
                 with st.expander(f"📁 {doc_type_key} ({len(documents)} versions)", expanded=True):
-                    # Display each version as a clean card instead of dataframe
-                    for doc in reversed(documents):  # Show newest first
-                        with st.container(border=True):
-                            col1, col2, col3, col4, col5 = st.columns([1, 2, 2, 1, 1])
-                            with col1:
-                                st.markdown(f"**{doc['version']}**")
-                            with col2:
-                                st.markdown(f"📄 {doc['filename']}")
-                            with col3:
-                                st.markdown(f"🕒 {doc['upload_date'].strftime('%Y-%m-%d %H:%M:%S')}")
-                            with col4:
-                                status_emoji = "✅" if doc['status'] == 'Processed' else "⏳"
-                                st.markdown(f"{status_emoji} {doc['status']}")
-                            with col5:
-                                if st.button(
-                                    "💬 Chat",
-                                    key=f"chat_{doc_type_key}_{doc['version']}"
-                                ):
-                                    st.session_state.active_chat_context = (
-                                        st.session_state.current_case_id,
-                                        doc_type_key,
-                                        doc['version']
-                                    )
-                                    st.rerun()
-                            if doc['notes']:
-                                st.caption(f"📝 {doc['notes']}")
-                            st.caption(f"Size: {doc['size_kb']:.2f} KB")
+                    # All shown versions go out as one markdown table; chatting
+                    # about a version is a single picker + button below it
+                    shown = visible_versions(documents, f"all_versions_{doc_type_key}")
+                    st.markdown(version_history_md(shown))
+
+                    col1, col2 = st.columns([3, 1], vertical_alignment="bottom")
+                    with col1:
+                        chat_version = st.selectbox(
+                            "Chat about version",
+                            [doc['version'] for doc in shown],
+                            key=f"chat_version_{doc_type_key}"
+                        )
+                    with col2:
+                        st.button(
+                            "💬 Chat",
+                            key=f"chat_{doc_type_key}",
+                            on_click=open_chat,
+                            args=((case_id, doc_type_key, chat_version),),
+                            use_container_width=True
+                        )
 
                     if len(documents) > 1:
                         st.info(f"ℹ️ Version change detection: {documents[-1]['version']} vs {documents[-2]['version']} - [Click to view diff] (mocked)")
@@ -535,17 +883,10 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 2: PPAP Checklist & Gap Analysis
     # ========================================================================
-    with tab2:
+    elif active_tab == WORKSPACE_TABS[1]:
         st.header("PPAP Checklist & Gap Analysis")
 
-        if st.button("🤖 Generate Checklist with AI", type="primary"):
-            current_case['checklist'] = mock_ai_checklist_generation()
-            add_activity_log(
-                st.session_state.current_case_id,
-                'AI_ANALYSIS',
-                'Generated PPAP checklist and gap analysis'
-            )
-            st.rerun()
+        st.button("🤖 Generate Checklist with AI", type="primary", on_click=generate_checklist, args=(case_id,))
 
         if current_case['checklist']:
             checklist = current_case['checklist']
@@ -562,12 +903,10 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 completion = (checklist['satisfied'] / checklist['total_items']) * 100
                 st.metric("Completion", f"{completion:.0f}%")
 
-            st.divider()
-
             # Detailed checklist
-            st.subheader("Detailed Requirements")
+            st.markdown("---\n### Detailed Requirements")
 
-            df_checklist = pd.DataFrame(checklist['items'])
+            df_checklist = checklist['items']
 
             # Filter options
             col1, col2 = st.columns([1, 1])
@@ -576,27 +915,15 @@ elif st.session_state.page == "PPAP_WORKSPACE":
             with col2:
                 filter_status = st.multiselect("Filter by Status", options=['Satisfied', 'Missing'], default=['Satisfied', 'Missing'])
 
-            filtered_df = df_checklist[
-                (df_checklist['category'].isin(filter_category)) &
-                (df_checklist['status'].isin(filter_status))
-            ]
-
-            # Style the dataframe
-            def highlight_status(row):
-                if row['status'] == 'Missing':
-                    return ['background-color: #ffebee'] * len(row)
-                else:
-                    return ['background-color: #e8f5e9'] * len(row)
+            # Cached per checklist and filter selection, so unrelated reruns
+            # reuse the filtered rows and the gap list
+            filtered_df, missing_items = checklist_view(df_checklist, tuple(filter_category), tuple(filter_status))
 
-            styled_df = filtered_df.style.apply(highlight_status, axis=1)
-
-            st.dataframe(styled_df, use_container_width=True, hide_index=True)
+            safe_display(filtered_df, "checklist", style=highlight_status)
 
             # Gap summary
-            st.divider()
-            st.subheader("⚠️ Gaps Requiring Attention")
+            st.markdown("---\n### ⚠️ Gaps Requiring Attention")
 
-            missing_items = df_checklist[df_checklist['status'] == 'Missing']
             for idx, item in missing_items.iterrows():
                 st.warning(f"**{item['category']}:** {item['requirement']}")
         else:
@@ -605,20 +932,18 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 3: FAIR Review
     # ========================================================================
-    with tab3:
+    elif active_tab == WORKSPACE_TABS[2]:
         st.header("FAIR (First Article Inspection Report) Review")
 
         if not current_case['documents']['FAIR']:
             st.warning("⚠️ No FAIR documents uploaded yet. Please upload a FAIR document in the Ingestion tab.")
         else:
-            if st.button("🤖 Analyze FAIR Document", type="primary"):
-                current_case['fair_analysis'] = mock_fair_analysis()
-                add_activity_log(
-                    st.session_state.current_case_id,
-                    'AI_ANALYSIS',
-                    'Completed FAIR document analysis'
-                )
-                st.rerun()
+            st.button(
+                "🤖 Analyze FAIR Document",
+                type="primary",
+                on_click=analyze_document,
+                args=(case_id, 'FAIR', mock_fair_analysis)
+            )
 
             if current_case['fair_analysis']:
                 fair = current_case['fair_analysis']
@@ -630,8 +955,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 with col2:
                     st.metric("Critical Dimensions", fair['critical_dimensions'])
                 with col3:
-                    passing = (fair['dimensions']['Status'] == 'Pass').sum()
-                    st.metric("Passing", f"{passing}/{len(fair['dimensions'])}")
+                    st.metric("Passing", fair['passing_summary'])
 
                 st.divider()
 
@@ -644,34 +968,24 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 with col3:
                     st.markdown(f"**Traceability:** {fair['traceability']}")
 
-                st.divider()
-
                 # Dimensional analysis table
-                st.subheader("Dimensional Analysis")
-
-                def highlight_tolerance(row):
-                    colors = []
-                    for col in row.index:
-                        if col == 'Tolerance_Used_%':
-                            val = row[col]
-                            if val > 80:
-                                colors.append('background-color: #ffebee')
-                            elif val > 60:
-                                colors.append('background-color: #fff3e0')
-                            else:
-                                colors.append('background-color: #e8f5e9')
-                        else:
-                            colors.append('')
-                    return colors
-
-                styled_dims = fair['dimensions'].style.apply(highlight_tolerance, axis=1)
-                st.dataframe(styled_dims, use_container_width=True, hide_index=True)
+                st.markdown("---\n### Dimensional Analysis")
+
+                safe_display(
+                    fair['dimensions'], "fair_dimensions",
+                    style=highlight_tolerance,
+                    column_config={
+                        "Tolerance_Used_%": st.column_config.NumberColumn(
+                            format="%.1f%%",
+                            help="Share of the tolerance band used by the measurement"
+                        )
+                    }
+                )
 
                 st.caption("🟢 Green: <60% tolerance used | 🟡 Orange: 60-80% | 🔴 Red: >80%")
 
                 # AI insights
-                st.divider()
-                st.subheader("🤖 AI Insights")
+                st.markdown("---\n### 🤖 AI Insights")
                 st.info("""
                 **Key Findings:**
                 - ✅ All measured dimensions are within specification limits
@@ -686,20 +1000,18 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 4: OQ Review
     # ========================================================================
-    with tab4:
+    elif active_tab == WORKSPACE_TABS[3]:
         st.header("OQ (Operational Qualification) Review")
 
         if not current_case['documents']['OQ']:
             st.warning("⚠️ No OQ documents uploaded yet. Please upload an OQ document in the Ingestion tab.")
         else:
-            if st.button("🤖 Analyze OQ Document", type="primary"):
-                current_case['oq_analysis'] = mock_oq_analysis()
-                add_activity_log(
-                    st.session_state.current_case_id,
-                    'AI_ANALYSIS',
-                    'Completed OQ document analysis'
-                )
-                st.rerun()
+            st.button(
+                "🤖 Analyze OQ Document",
+                type="primary",
+                on_click=analyze_document,
+                args=(case_id, 'OQ', mock_oq_analysis)
+            )
 
             if current_case['oq_analysis']:
                 oq = current_case['oq_analysis']
@@ -723,27 +1035,19 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                     for section in oq['sections_missing']:
                         st.error(f"✗ {section}")
 
-                st.divider()
-
                 # Equipment qualification
-                st.subheader("Equipment Qualification Status")
-                st.dataframe(oq['equipment'], use_container_width=True, hide_index=True)
-
-                st.divider()
+                st.markdown("---\n### Equipment Qualification Status")
+                safe_display(oq['equipment'], "oq_equipment")
 
                 # Process parameters
-                st.subheader("Validated Process Parameters")
+                st.markdown("---\n### Validated Process Parameters")
 
-                params_df = pd.DataFrame({
-                    'Parameter': list(oq['process_params'].keys()),
-                    'Specification': list(oq['process_params'].values())
-                })
+                params_df = process_params_df(tuple(oq['process_params'].items()))
 
                 st.dataframe(params_df, use_container_width=True, hide_index=True)
 
                 # AI insights
-                st.divider()
-                st.subheader("🤖 AI Insights")
+                st.markdown("---\n### 🤖 AI Insights")
                 st.warning("""
                 **Key Findings:**
                 - ✅ All critical equipment is qualified and calibrated
@@ -758,20 +1062,18 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 5: PQ Review
     # ========================================================================
-    with tab5:
+    elif active_tab == WORKSPACE_TABS[4]:
         st.header("PQ (Performance Qualification) Review")
 
         if not current_case['documents']['PQ']:
             st.warning("⚠️ No PQ documents uploaded yet. Please upload a PQ document in the Ingestion tab.")
         else:
-            if st.button("🤖 Analyze PQ Document", type="primary"):
-                current_case['pq_analysis'] = mock_pq_analysis()
-                add_activity_log(
-                    st.session_state.current_case_id,
-                    'AI_ANALYSIS',
-                    'Completed PQ document analysis'
-                )
-                st.rerun()
+            st.button(
+                "🤖 Analyze PQ Document",
+                type="primary",
+                on_click=analyze_document,
+                args=(case_id, 'PQ', mock_pq_analysis)
+            )
 
             if current_case['pq_analysis']:
                 pq = current_case['pq_analysis']
@@ -790,39 +1092,29 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 run_status = "✅" if pq['run_status'] == 'Sufficient' else "⚠️"
                 st.markdown(f"### {run_status} Run Status: {pq['run_status']}")
 
-                st.divider()
-
                 # SPC data
-                st.subheader("Statistical Process Control (SPC) Analysis")
-
-                def highlight_cpk(row):
-                    colors = []
-                    for col in row.index:
-                        if col == 'Cpk':
-                            val = row[col]
-                            if val >= 1.67:
-                                colors.append('background-color: #e8f5e9')
-                            elif val >= 1.33:
-                                colors.append('background-color: #fff3e0')
-                            else:
-                                colors.append('background-color: #ffebee')
-                        else:
-                            colors.append('')
-                    return colors
-
-                styled_spc = pq['spc_data'].style.apply(highlight_cpk, axis=1)
-                st.dataframe(styled_spc, use_container_width=True, hide_index=True)
+                st.markdown("---\n### Statistical Process Control (SPC) Analysis")
+
+                safe_display(
+                    pq['spc_data'], "pq_spc",
+                    style=highlight_cpk,
+                    column_config={
+                        "Cp": st.column_config.NumberColumn(format="%.2f"),
+                        "Cpk": st.column_config.NumberColumn(
+                            format="%.2f",
+                            help="Process capability index - 1.33 minimum, 1.67 target"
+                        )
+                    }
+                )
 
                 st.caption("🟢 Cpk ≥ 1.67: Excellent | 🟡 Cpk ≥ 1.33: Acceptable | 🔴 Cpk < 1.33: Unacceptable")
 
                 # Validation notes
-                st.divider()
-                st.subheader("📋 Validation Summary")
+                st.markdown("---\n### 📋 Validation Summary")
                 st.markdown(f"**Notes:** {pq['validation_notes']}")
 
                 # AI insights
-                st.divider()
-                st.subheader("🤖 AI Insights")
+                st.markdown("---\n### 🤖 AI Insights")
                 st.success("""
                 **Key Findings:**
                 - ✅ Production run size exceeds minimum requirement (50 vs 30 required)
@@ -838,7 +1130,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 6: Reports
     # ========================================================================
-    with tab6:
+    elif active_tab == WORKSPACE_TABS[5]:
         st.header("PPAP Summary Reports")
 
         st.markdown("Generate comprehensive PPAP review reports for submission and archival.")
@@ -868,11 +1160,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 st.markdown(f"**Process:** {current_case['process']}")
                 st.markdown("---")
                 st.markdown("**Document Status:**")
-                for doc_type, docs in current_case['documents'].items():
-                    if docs:
-                        st.markdown(f"- {doc_type}: v{len(docs)} uploaded")
-                    else:
-                        st.markdown(f"- {doc_type}: Not uploaded")
+                st.markdown(current_case['document_status_md'])
 
         st.divider()
 
@@ -884,7 +1172,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                 with st.spinner("Generating PPAP summary report..."):
                     # Mock report generation
                     add_activity_log(
-                        st.session_state.current_case_id,
+                        case_id,
                         'REPORT_GENERATED',
                         f'Generated PPAP summary report ({report_format})'
                     )
@@ -892,27 +1180,16 @@ elif st.session_state.page == "PPAP_WORKSPACE":
 
         with col2:
             # Mock download button
-            mock_report_content = f"""
-            PPAP Summary Report
-            Part Number: {current_case['part_number']}
-            Revision: {current_case['revision']}
-            Supplier: {current_case['supplier']}
-
-            This is a mock report for demonstration purposes.
-            """
-
             st.download_button(
                 label=f"⬇️ Download {report_format}",
-                data=mock_report_content,
+                data=build_mock_report(current_case['part_number'], current_case['revision'], current_case['supplier']),
                 file_name=f"PPAP_Report_{current_case['part_number']}_{current_case['revision']}.{'pdf' if report_format == 'PDF' else 'docx'}",
                 mime="application/pdf" if report_format == "PDF" else "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                 use_container_width=True
             )
 
-        st.divider()
-
         # Report history
-        st.subheader("Report Generation History")
+        st.markdown("---\n### Report Generation History")
 
         # Mock report history
         report_history = pd.DataFrame({
@@ -928,7 +1205,7 @@ elif st.session_state.page == "PPAP_WORKSPACE":
     # ========================================================================
     # TAB 7: PPAP Coaching Chat
     # ========================================================================
-    with tab7:
+    elif active_tab == WORKSPACE_TABS[6]:
         st.header("💬 PPAP Coaching Chat")
 
         # Split layout: left = documents, right = chat
@@ -945,75 +1222,27 @@ elif st.session_state.page == "PPAP_WORKSPACE":
                     continue
 
                 with st.expander(f"{doc_type_key}", expanded=True):
-                    for doc in reversed(documents):
+                    for doc in visible_versions(documents, f"all_chat_versions_{doc_type_key}"):
                         is_active = (
                             st.session_state.active_chat_context ==
-                            (st.session_state.current_case_id, doc_type_key, doc['version'])
+                            (case_id, doc_type_key, doc['version'])
                         )
 
                         button_label = "💬 Active" if is_active else "💬 Chat"
 
-                        if st.button(
+                        st.button(
                             f"{doc['version']} – {doc['filename']}",
                             key=f"chat_select_{doc_type_key}_{doc['version']}",
-                            use_container_width=True
-                        ):
-                            st.session_state.active_chat_context = (
-                                st.session_state.current_case_id,
-                                doc_type_key,
-                                doc['version']
-                            )
-                            st.rerun()
+                            use_container_width=True,
+                            on_click=open_chat,
+                            args=((case_id, doc_type_key, doc['version']),)
+                        )
 
         # --------------------------------------------------
         # RIGHT: Chat Window
         # --------------------------------------------------
         with right_col:
-            if not st.session_state.active_chat_context:
-                st.info("👈 Select a document version to start chatting.")
-                st.stop()
-
-            case_id, doc_type, version = st.session_state.active_chat_context
-            chat_key = f"{case_id}:{doc_type}:{version}"
-
-            st.markdown(f"""
-            **Context**
-            - Part: `{current_case['part_number']}` Rev `{current_case['revision']}`
-            - Document: **{doc_type}**
-            - Version: **{version}**
-            """)
-
-            if chat_key not in st.session_state.chat_history:
-                st.session_state.chat_history[chat_key] = []
-
-            messages = st.session_state.chat_history[chat_key]
-
-            chat_container = st.container(height=420)
-            with chat_container:
-                for msg in messages:
-                    with st.chat_message(msg["role"]):
-                        st.markdown(msg["content"])
-
-            user_input = st.chat_input(f"Ask about {doc_type} {version}...")
-
-            if user_input:
-                messages.append({"role": "user", "content": user_input})
-
-                ai_response = (
-                    f"This response is scoped to **{doc_type} {version}**.\n\n"
-                    "Only this document version is considered. "
-                    "Other PPAP documents or versions are excluded."
-                )
-
-                messages.append({"role": "assistant", "content": ai_response})
-
-                add_activity_log(
-                    case_id,
-                    "CHAT_INTERACTION",
-                    f"Chat on {doc_type} {version}: {user_input[:60]}"
-                )
-
-                st.rerun()
+            coaching_chat(current_case)
 
 
     # ========================================================================
@@ -1023,32 +1252,30 @@ elif st.session_state.page == "PPAP_WORKSPACE":
 
     with st.expander("📋 Audit Trail / Activity Log", expanded=False):
         if case_id in st.session_state.activity_log and st.session_state.activity_log[case_id]:
-            # Display audit log entries in reverse chronological order with clean formatting
-            audit_entries = reversed(st.session_state.activity_log[case_id])
-
-            for entry in audit_entries:
-                # Choose icon based on activity type
-                icon_map = {
-                    'CASE_CREATED': '📋',
-                    'DOCUMENT_UPLOAD': '📤',
-                    'AI_PROCESSING': '🤖',
-                    'AI_ANALYSIS': '🔍',
-                    'REPORT_GENERATED': '📄',
-                    'CHAT_INTERACTION': '💬'
-                }
-                icon = icon_map.get(entry['type'], '📌')
-
-                # Format activity type for display
-                activity_display = entry['type'].replace('_', ' ').title()
+            case_log = st.session_state.activity_log[case_id]
+            visible_key = f"audit_visible:{case_id}"
+            visible = st.session_state.get(visible_key, AUDIT_VISIBLE_ENTRIES)
+
+            # Display the newest entries in reverse chronological order with clean formatting
+            for entry in islice(reversed(case_log), visible):
+                heading = ACTIVITY_HEADINGS.get(entry.type) or f"📌 **{entry.type.replace('_', ' ').title()}**"
 
                 with st.container(border=True):
                     col1, col2 = st.columns([1, 4])
                     with col1:
-                        st.markdown(f"**{entry['timestamp'].strftime('%H:%M:%S')}**")
-                        st.caption(entry['timestamp'].strftime('%Y-%m-%d'))
+                        st.markdown(f"**{entry.stamp[11:]}**")
+                        st.caption(entry.stamp[:10])
                     with col2:
-                        st.markdown(f"{icon} **{activity_display}**")
-                        st.markdown(entry['description'])
+                        st.markdown(heading)
+                        st.markdown(entry.description)
+
+            if len(case_log) > visible:
+                st.button(
+                    f"⬇ Show older entries ({len(case_log) - visible} more)",
+                    key=f"show_older:{case_id}",
+                    on_click=show_more,
+                    args=(visible_key, AUDIT_VISIBLE_ENTRIES)
+                )
         else:
             st.info("No activity recorded yet for this PPAP case.")
 
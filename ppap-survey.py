@@ -10,6 +10,14 @@ Internal use only - Runs on Medtronic secure network with internal LLM
 import streamlit as st
 from datetime import datetime
 
+LOGO_PATH = "images.png"
+
+# Internal-use badge shown under the logo, shipped as a single element
+INTERNAL_BADGE_HTML = (
+    '<h3 style="margin:0">🔒 Internal Use Only</h3>'
+    '<small style="opacity:0.6">Medtronic • Secure Network • Internal LLM</small>'
+)
+
 # Page configuration
 st.set_page_config(
     page_title="PPAP Eligibility Survey - Medtronic",
@@ -18,454 +26,497 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+def new_survey_responses():
+    """Fresh, unanswered survey responses"""
+    return {
+        'q1_molding_surgical': None,
+        'q2_new_product': None,
+        'q3_process_verified': None,
+        'q4_fixed_setpoints': None
+    }
+
+# Session state defaults - callables are factories for mutable values so each
+# session gets its own object
+SESSION_DEFAULTS = {
+    'survey_page': "WELCOME",  # WELCOME, Q1, Q2, Q3, Q4, RESULT
+    'survey_responses': new_survey_responses,
+    'survey_eligible': None,
+    'survey_reasons': list,
+    'survey_completion_date': None,
+}
+
 # Initialize session state
 def init_survey_state():
     """Initialize survey-related session state variables"""
-
-    if 'survey_page' not in st.session_state:
-        st.session_state.survey_page = "WELCOME"  # WELCOME, Q1, Q2, Q3, Q4, RESULT
-
-    if 'survey_responses' not in st.session_state:
-        st.session_state.survey_responses = {
-            'q1_molding_surgical': None,
-            'q2_new_product': None,
-            'q3_process_verified': None,
-            'q4_fixed_setpoints': None
-        }
-
-    if 'survey_eligible' not in st.session_state:
-        st.session_state.survey_eligible = None
-
-    if 'survey_completion_date' not in st.session_state:
-        st.session_state.survey_completion_date = None
+    for key, default in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, default() if callable(default) else default)
 
 def reset_survey():
     """Reset survey to start over"""
     st.session_state.survey_page = "WELCOME"
-    st.session_state.survey_responses = {
-        'q1_molding_surgical': None,
-        'q2_new_product': None,
-        'q3_process_verified': None,
-        'q4_fixed_setpoints': None
-    }
+    st.session_state.survey_responses = new_survey_responses()
     st.session_state.survey_eligible = None
+    st.session_state.survey_reasons = []
     st.session_state.survey_completion_date = None
 
+def set_page(page):
+    """Navigation button callback - switch pages before the next run renders anything"""
+    st.session_state.survey_page = page
+
+def record_answer(question_key, answer, next_page):
+    """Answer button callback - store the answer and move on before the next run renders"""
+    st.session_state.survey_responses[question_key] = answer
+    st.session_state.survey_page = next_page
+
+    # The answers are final once the result page is reached, so the outcome
+    # is worked out here rather than on every run of that page
+    if next_page == "RESULT":
+        is_eligible = check_eligibility()
+        st.session_state.survey_eligible = is_eligible
+        st.session_state.survey_reasons = [] if is_eligible else get_ineligibility_reason()
+
+# Ineligibility explanations, keyed by survey question
+INELIGIBILITY_REASONS = {
+    'q1_molding_surgical': {
+        'question': 'PPAP Process Type',
+        'response': 'Not molding plastic processes under Surgical Operation Unit',
+        'explanation': 'This system is specifically designed for PPAPs associated with **injection-molded plastic parts** within the **Surgical Operation Unit**. Other processes or business units are not currently supported by this tool.'
+    },
+    'q2_new_product': {
+        'question': 'Product Type',
+        'response': 'Not a new product part',
+        'explanation': 'This system currently focuses on **new product parts only**. Legacy products may have different PPAP requirements and workflows. For legacy products, we would need to check for previously approved PPAP tickets and potentially combine documentation, which requires a different review process.'
+    },
+    'q4_fixed_setpoints': {
+        'question': 'Process Parameters',
+        'response': 'Process will be run at fixed set points without parameter ranges',
+        'explanation': 'Manufacturing processes should have defined **parameter ranges** rather than single fixed setpoints. Parameter ranges allow for normal process variation while maintaining quality. Fixed setpoints without ranges indicate insufficient process understanding or validation, which does not meet PPAP requirements for robust manufacturing processes.'
+    }
+}
+
+# (question, disqualifying answer) in display order
+INELIGIBLE_ANSWERS = (
+    ('q1_molding_surgical', 'No'),
+    ('q2_new_product', 'No'),
+    ('q4_fixed_setpoints', 'Yes')
+)
+
 def check_eligibility():
     """Check if user is eligible based on survey responses"""
     responses = st.session_state.survey_responses
 
-    # If Q1 or Q2 is No -> Not eligible
-    if responses['q1_molding_surgical'] == 'No' or responses['q2_new_product'] == 'No':
-        return False
-
-    # If Q4 is Yes -> Not eligible
-    if responses['q4_fixed_setpoints'] == 'Yes':
-        return False
-
-    # Otherwise eligible
-    return True
+    # Not eligible if Q1 or Q2 is No, or Q4 is Yes
+    return not any(responses[question] == answer for question, answer in INELIGIBLE_ANSWERS)
 
 def get_ineligibility_reason():
     """Get reason for ineligibility with explanation"""
     responses = st.session_state.survey_responses
 
-    reasons = []
+    return [
+        INELIGIBILITY_REASONS[question]
+        for question, answer in INELIGIBLE_ANSWERS
+        if responses[question] == answer
+    ]
 
-    if responses['q1_molding_surgical'] == 'No':
-        reasons.append({
-            'question': 'PPAP Process Type',
-            'response': 'Not molding plastic processes under Surgical Operation Unit',
-            'explanation': 'This system is specifically designed for PPAPs associated with **injection-molded plastic parts** within the **Surgical Operation Unit**. Other processes or business units are not currently supported by this tool.'
-        })
+# ============================================================================
+# SURVEY CONTENT
+# ============================================================================
 
-    if responses['q2_new_product'] == 'No':
-        reasons.append({
-            'question': 'Product Type',
-            'response': 'Not a new product part',
-            'explanation': 'This system currently focuses on **new product parts only**. Legacy products may have different PPAP requirements and workflows. For legacy products, we would need to check for previously approved PPAP tickets and potentially combine documentation, which requires a different review process.'
-        })
+WELCOME_MD = """
+## Welcome to the PPAP Review System
 
-    if responses['q4_fixed_setpoints'] == 'Yes':
-        reasons.append({
-            'question': 'Process Parameters',
-            'response': 'Process will be run at fixed set points without parameter ranges',
-            'explanation': 'Manufacturing processes should have defined **parameter ranges** rather than single fixed setpoints. Parameter ranges allow for normal process variation while maintaining quality. Fixed setpoints without ranges indicate insufficient process understanding or validation, which does not meet PPAP requirements for robust manufacturing processes.'
-        })
+This tool automates the review of PPAP (Production Part Approval Process) documentation
+for **injection-molded plastic parts** within the **Surgical Operation Unit**.
 
-    return reasons
+Before creating a PPAP case, please complete a brief eligibility survey to ensure
+this system is appropriate for your specific PPAP requirements.
 
-# Initialize state
-init_survey_state()
+### What You'll Need to Know:
+- Process type and business unit
+- Product classification (new vs. legacy)
+- Process verification status
+- Process parameter specifications
 
-# ============================================================================
-# MAIN CONTENT AREA
-# ============================================================================
+The survey takes approximately **1-2 minutes** to complete.
 
-# Center the content
-left_space, center_col, right_space = st.columns([1, 3, 1])
+---
+"""
 
-with center_col:
-    # Header section
-    st.title("PPAP Eligibility Survey")
-    st.markdown("### Medtronic PPAP Document Review System")
+Q1_HEADER_MD = """
+---
 
-    with st.container(border=True):
-        st.image("images.png", width=120)
-        st.markdown("### 🔒 Internal Use Only")
-        st.caption("Medtronic • Secure Network • Internal LLM")
+## Question 1: Process Type and Business Unit
 
-    st.markdown("---")
+Is this PPAP associated with **molding plastic processes** under the **Surgical Operation Unit**?
+"""
 
-    # ========================================================================
-    # WELCOME PAGE
-    # ========================================================================
-    if st.session_state.survey_page == "WELCOME":
-        st.markdown("""
-        ## Welcome to the PPAP Review System
+Q1_INFO_MD = """
+**What this means:**
+- **Molding plastic processes:** Injection molding or similar plastic manufacturing processes
+- **Surgical Operation Unit:** Business unit responsible for surgical devices and components
 
-        This tool automates the review of PPAP (Production Part Approval Process) documentation
-        for **injection-molded plastic parts** within the **Surgical Operation Unit**.
+This system is specifically designed for plastic molding processes within the Surgical Operation Unit.
+"""
 
-        Before creating a PPAP case, please complete a brief eligibility survey to ensure
-        this system is appropriate for your specific PPAP requirements.
+Q2_HEADER_MD = """
+---
 
-        ### What You'll Need to Know:
-        - Process type and business unit
-        - Product classification (new vs. legacy)
-        - Process verification status
-        - Process parameter specifications
+## Question 2: Product Classification
 
-        The survey takes approximately **1-2 minutes** to complete.
-        """)
+Is this PPAP associated with a **new product part**?
+"""
 
-        st.markdown("---")
+Q2_INFO_MD = """
+**What this means:**
+- **New product part:** A part that has not been previously manufactured or approved
+- **Not a new product part:** Legacy products, existing parts with revisions, or previously approved parts
 
-        if st.button("Begin Eligibility Survey", type="primary", use_container_width=True):
-            st.session_state.survey_page = "Q1"
-            st.rerun()
+This system currently supports new product parts only. Legacy products require different workflows
+(such as checking for previously approved PPAP tickets and combining documentation).
+"""
 
-    # ========================================================================
-    # QUESTION 1: Molding Plastic Process - Surgical Operation Unit
-    # ========================================================================
-    elif st.session_state.survey_page == "Q1":
-        # Progress indicator
-        st.progress(0.25)
-        st.caption("Question 1 of 4")
-        st.markdown("---")
+Q3_HEADER_MD = """
+---
 
-        st.markdown("""
-        ## Question 1: Process Type and Business Unit
+## Question 3: Process Verification Status
 
-        Is this PPAP associated with **molding plastic processes** under the **Surgical Operation Unit**?
-        """)
+Is the **process output fully verified**?
+"""
 
-        with st.container(border=True):
-            st.info("""
-            **What this means:**
-            - **Molding plastic processes:** Injection molding or similar plastic manufacturing processes
-            - **Surgical Operation Unit:** Business unit responsible for surgical devices and components
+Q3_INFO_MD = """
+**What this means:**
+- **Fully verified:** The manufacturing process has been validated and produces consistent,
+  specification-compliant parts
+- Process capability studies (Cpk) have been completed
+- First article inspection has been performed
+- Production runs demonstrate consistent output
 
-            This system is specifically designed for plastic molding processes within the Surgical Operation Unit.
-            """)
+Full process verification is essential for PPAP approval and ensures manufacturing readiness.
+"""
 
-        col1, col2 = st.columns(2)
+Q4_HEADER_MD = """
+---
 
-        with col1:
-            if st.button("✅ Yes", use_container_width=True, type="primary"):
-                st.session_state.survey_responses['q1_molding_surgical'] = 'Yes'
-                st.session_state.survey_page = "Q2"
-                st.rerun()
+## Question 4: Process Parameter Specification
 
-        with col2:
-            if st.button("❌ No", use_container_width=True):
-                st.session_state.survey_responses['q1_molding_surgical'] = 'No'
-                st.session_state.survey_page = "RESULT"
-                st.rerun()
+Will the process be run at **fixed set points** without a range of process limits or parameters?
+"""
 
-        st.markdown("---")
+Q4_INFO_MD = """
+**What this means:**
+- **Fixed setpoints (NOT recommended):** Process parameters are specified as exact single values
+  (e.g., Temperature = 280°C, Pressure = 1200 bar)
+- **Parameter ranges (RECOMMENDED):** Process parameters are specified with acceptable ranges
+  (e.g., Temperature = 280°C ± 5°C, Pressure = 1200 bar ± 50 bar)
+
+**Why ranges are required:**
+- Manufacturing processes naturally have variation
+- Parameter ranges demonstrate process understanding and robustness
+- Fixed setpoints without ranges do not meet PPAP requirements for production readiness
+"""
 
-        if st.button("⬅ Back to Welcome"):
-            st.session_state.survey_page = "WELCOME"
-            st.rerun()
+Q4_WARNING_MD = """
+**Note:** If your process uses fixed setpoints without ranges, it may not be ready for PPAP approval.
+Robust manufacturing processes should define acceptable parameter ranges.
+"""
 
-    # ========================================================================
-    # QUESTION 2: New Product Part
-    # ========================================================================
-    elif st.session_state.survey_page == "Q2":
-        # Progress indicator
-        st.progress(0.50)
-        st.caption("Question 2 of 4")
-        st.markdown("---")
+ELIGIBLE_MD = """
+## ✅ System Suitable for Your PPAP
 
-        st.markdown("""
-        ## Question 2: Product Classification
+Based on your responses, this PPAP AI Review System is appropriate for your use case.
+"""
 
-        Is this PPAP associated with a **new product part**?
-        """)
+NEXT_STEPS_MD = """
+### Next Steps:
+1. Click "Proceed to PPAP Case Setup" below
+2. Create a new PPAP case with part details
+3. Upload required documents (FAIR, OQ, PQ)
+4. Use AI-powered analysis for document review
+
+### System Capabilities:
+- Automated PPAP checklist generation
+- Dimensional analysis from FAIR documents
+- Equipment qualification validation (OQ)
+- Statistical process control analysis (PQ)
+- Gap detection and recommendations
+- Comprehensive report generation
+"""
 
-        with st.container(border=True):
-            st.info("""
-            **What this means:**
-            - **New product part:** A part that has not been previously manufactured or approved
-            - **Not a new product part:** Legacy products, existing parts with revisions, or previously approved parts
+UNVERIFIED_WARNING_MD = """
+**Note:** You indicated the process output is not fully verified. While you can proceed with
+the PPAP documentation review, please ensure process verification is completed before final
+PPAP approval. The system will flag any missing verification documentation.
+"""
 
-            This system currently supports new product parts only. Legacy products require different workflows
-            (such as checking for previously approved PPAP tickets and combining documentation).
-            """)
+INELIGIBLE_MD = """
+## ⚠️ System Not Suitable for This PPAP
 
-        col1, col2 = st.columns(2)
+Based on your responses, this PPAP AI Review System may not be appropriate for your use case.
+"""
 
-        with col1:
-            if st.button("✅ Yes", use_container_width=True, type="primary"):
-                st.session_state.survey_responses['q2_new_product'] = 'Yes'
-                st.session_state.survey_page = "Q3"
-                st.rerun()
+RECOMMENDED_ACTIONS_MD = """
+### Recommended Actions:
 
-        with col2:
-            if st.button("❌ No", use_container_width=True):
-                st.session_state.survey_responses['q2_new_product'] = 'No'
-                st.session_state.survey_page = "RESULT"
-                st.rerun()
+**For Non-Molding or Non-Surgical Unit PPAPs:**
+- Contact your business unit's PPAP coordinator for appropriate review processes
+- Different processes may have specialized requirements not covered by this system
 
-        st.markdown("---")
+**For Legacy Product Parts:**
+- Check for existing PPAP tickets for the product
+- Coordinate with Quality Engineering to determine if documentation should be combined with previous approvals
+- Legacy product PPAPs may require a different workflow (to be added in future system updates)
 
-        if st.button("⬅ Back to Question 1"):
-            st.session_state.survey_page = "Q1"
-            st.rerun()
+**For Fixed Setpoint Processes:**
+- Work with Process Engineering to establish acceptable parameter ranges
+- Complete process capability studies to determine appropriate tolerances
+- Ensure process robustness before proceeding with PPAP
+- Parameter ranges are essential for FDA compliance and manufacturing reliability
 
-    # ========================================================================
-    # QUESTION 3: Process Output Verification
-    # ========================================================================
-    elif st.session_state.survey_page == "Q3":
-        # Progress indicator
-        st.progress(0.75)
-        st.caption("Question 3 of 4")
-        st.markdown("---")
+### Need Help?
+If you believe your PPAP should be eligible or have questions about these requirements,
+please contact the PPAP Support Team or your Quality Engineering representative.
+"""
 
-        st.markdown("""
-        ## Question 3: Process Verification Status
+# Filled from st.session_state.survey_responses with format_map
+SURVEY_RESPONSES_MD = """
+### Your Responses:
+1. **Molding plastic processes under Surgical Operation Unit?** {q1_molding_surgical}
+2. **New product part?** {q2_new_product}
+3. **Process output fully verified?** {q3_process_verified}
+4. **Fixed setpoints without parameter ranges?** {q4_fixed_setpoints}
+"""
 
-        Is the **process output fully verified**?
-        """)
+@st.cache_resource(show_spinner=False)
+def load_logo():
+    """Read the logo once per process; None if the file is missing"""
+    try:
+        with open(LOGO_PATH, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
 
-        with st.container(border=True):
-            st.info("""
-            **What this means:**
-            - **Fully verified:** The manufacturing process has been validated and produces consistent,
-              specification-compliant parts
-            - Process capability studies (Cpk) have been completed
-            - First article inspection has been performed
-            - Production runs demonstrate consistent output
+# ============================================================================
+# SURVEY PAGES
+# ============================================================================
 
-            Full process verification is essential for PPAP approval and ensures manufacturing readiness.
-            """)
+# ============================================================================
+# WELCOME PAGE
+# ============================================================================
+def render_welcome():
+    """Welcome page - what the survey covers"""
+    st.markdown(WELCOME_MD)
 
-        col1, col2 = st.columns(2)
+    st.button("Begin Eligibility Survey", type="primary", use_container_width=True, on_click=set_page, args=("Q1",))
 
-        with col1:
-            if st.button("✅ Yes", use_container_width=True, type="primary"):
-                st.session_state.survey_responses['q3_process_verified'] = 'Yes'
-                st.session_state.survey_page = "Q4"
-                st.rerun()
+# ============================================================================
+# QUESTION 1: Molding Plastic Process - Surgical Operation Unit
+# ============================================================================
+def render_q1():
+    """Question 1 - process type and business unit"""
+    # Progress indicator
+    st.progress(0.25, text="Question 1 of 4")
 
-        with col2:
-            if st.button("❌ No", use_container_width=True):
-                st.session_state.survey_responses['q3_process_verified'] = 'No'
-                st.session_state.survey_page = "Q4"
-                st.rerun()
+    st.markdown(Q1_HEADER_MD)
 
-        st.markdown("---")
+    with st.container(border=True):
+        st.info(Q1_INFO_MD)
 
-        if st.button("⬅ Back to Question 2"):
-            st.session_state.survey_page = "Q2"
-            st.rerun()
+    col1, col2 = st.columns(2)
 
-    # ========================================================================
-    # QUESTION 4: Process Parameters - Fixed Setpoints vs Ranges
-    # ========================================================================
-    elif st.session_state.survey_page == "Q4":
-        # Progress indicator
-        st.progress(1.0)
-        st.caption("Question 4 of 4")
-        st.markdown("---")
+    with col1:
+        st.button("✅ Yes", use_container_width=True, type="primary", on_click=record_answer, args=('q1_molding_surgical', 'Yes', "Q2"))
 
-        st.markdown("""
-        ## Question 4: Process Parameter Specification
+    with col2:
+        st.button("❌ No", use_container_width=True, on_click=record_answer, args=('q1_molding_surgical', 'No', "RESULT"))
 
-        Will the process be run at **fixed set points** without a range of process limits or parameters?
-        """)
+    st.markdown("---")
 
-        with st.container(border=True):
-            st.info("""
-            **What this means:**
-            - **Fixed setpoints (NOT recommended):** Process parameters are specified as exact single values
-              (e.g., Temperature = 280°C, Pressure = 1200 bar)
-            - **Parameter ranges (RECOMMENDED):** Process parameters are specified with acceptable ranges
-              (e.g., Temperature = 280°C ± 5°C, Pressure = 1200 bar ± 50 bar)
+    st.button("⬅ Back to Welcome", on_click=set_page, args=("WELCOME",))
 
-            **Why ranges are required:**
-            - Manufacturing processes naturally have variation
-            - Parameter ranges demonstrate process understanding and robustness
-            - Fixed setpoints without ranges do not meet PPAP requirements for production readiness
-            """)
+# ============================================================================
+# QUESTION 2: New Product Part
+# ============================================================================
+def render_q2():
+    """Question 2 - new or legacy product part"""
+    # Progress indicator
+    st.progress(0.50, text="Question 2 of 4")
 
-        st.warning("""
-        **Note:** If your process uses fixed setpoints without ranges, it may not be ready for PPAP approval.
-        Robust manufacturing processes should define acceptable parameter ranges.
-        """)
+    st.markdown(Q2_HEADER_MD)
 
-        col1, col2 = st.columns(2)
+    with st.container(border=True):
+        st.info(Q2_INFO_MD)
 
-        with col1:
-            if st.button("Yes - Fixed setpoints only", use_container_width=True):
-                st.session_state.survey_responses['q4_fixed_setpoints'] = 'Yes'
-                st.session_state.survey_page = "RESULT"
-                st.rerun()
+    col1, col2 = st.columns(2)
 
-        with col2:
-            if st.button("✅ No - Has parameter ranges", use_container_width=True, type="primary"):
-                st.session_state.survey_responses['q4_fixed_setpoints'] = 'No'
-                st.session_state.survey_page = "RESULT"
-                st.rerun()
+    with col1:
+        st.button("✅ Yes", use_container_width=True, type="primary", on_click=record_answer, args=('q2_new_product', 'Yes', "Q3"))
 
-        st.markdown("---")
+    with col2:
+        st.button("❌ No", use_container_width=True, on_click=record_answer, args=('q2_new_product', 'No', "RESULT"))
 
-        if st.button("⬅ Back to Question 3"):
-            st.session_state.survey_page = "Q3"
-            st.rerun()
+    st.markdown("---")
 
-    # ========================================================================
-    # RESULT PAGE
-    # ========================================================================
-    elif st.session_state.survey_page == "RESULT":
-        st.markdown("---")
+    st.button("⬅ Back to Question 1", on_click=set_page, args=("Q1",))
 
-        # Determine eligibility
-        is_eligible = check_eligibility()
-        st.session_state.survey_eligible = is_eligible
+# ============================================================================
+# QUESTION 3: Process Output Verification
+# ============================================================================
+def render_q3():
+    """Question 3 - process output verification"""
+    # Progress indicator
+    st.progress(0.75, text="Question 3 of 4")
+
+    st.markdown(Q3_HEADER_MD)
+
+    with st.container(border=True):
+        st.info(Q3_INFO_MD)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.button("✅ Yes", use_container_width=True, type="primary", on_click=record_answer, args=('q3_process_verified', 'Yes', "Q4"))
+
+    with col2:
+        st.button("❌ No", use_container_width=True, on_click=record_answer, args=('q3_process_verified', 'No', "Q4"))
+
+    st.markdown("---")
+
+    st.button("⬅ Back to Question 2", on_click=set_page, args=("Q2",))
+
+# ============================================================================
+# QUESTION 4: Process Parameters - Fixed Setpoints vs Ranges
+# ============================================================================
+def render_q4():
+    """Question 4 - fixed setpoints vs parameter ranges"""
+    # Progress indicator
+    st.progress(1.0, text="Question 4 of 4")
+
+    st.markdown(Q4_HEADER_MD)
+
+    with st.container(border=True):
+        st.info(Q4_INFO_MD)
+
+    st.warning(Q4_WARNING_MD)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.button("Yes - Fixed setpoints only", use_container_width=True, on_click=record_answer, args=('q4_fixed_setpoints', 'Yes', "RESULT"))
+
+    with col2:
+        st.button("✅ No - Has parameter ranges", use_container_width=True, type="primary", on_click=record_answer, args=('q4_fixed_setpoints', 'No', "RESULT"))
+
+    st.markdown("---")
+
+    st.button("⬅ Back to Question 3", on_click=set_page, args=("Q3",))
+
+# ============================================================================
+# RESULT PAGE
+# ============================================================================
+def render_result():
+    """Survey summary with the eligible / ineligible outcome"""
+    # Eligibility was decided by the answer that led here
+    is_eligible = st.session_state.survey_eligible
+    if st.session_state.survey_completion_date is None:
         st.session_state.survey_completion_date = datetime.now()
 
-        # Display survey summary
-        st.markdown("## Survey Summary")
+    # Display survey summary
+    st.markdown("---\n\n## Survey Summary")
 
-        with st.container(border=True):
-            st.markdown("### Your Responses:")
-            st.markdown(f"""
-            1. **Molding plastic processes under Surgical Operation Unit?** {st.session_state.survey_responses['q1_molding_surgical']}
-            2. **New product part?** {st.session_state.survey_responses['q2_new_product']}
-            3. **Process output fully verified?** {st.session_state.survey_responses['q3_process_verified']}
-            4. **Fixed setpoints without parameter ranges?** {st.session_state.survey_responses['q4_fixed_setpoints']}
-            """)
+    with st.container(border=True):
+        st.markdown(SURVEY_RESPONSES_MD.format_map(st.session_state.survey_responses))
+
+    st.markdown("---")
+
+    # ========================================================================
+    # ELIGIBLE RESULT
+    # ========================================================================
+    if is_eligible:
+        st.success(ELIGIBLE_MD)
+
+        st.markdown(NEXT_STEPS_MD)
+
+        # Additional notes based on Q3
+        if st.session_state.survey_responses['q3_process_verified'] == 'No':
+            st.warning(UNVERIFIED_WARNING_MD)
 
         st.markdown("---")
 
-        # ========================================================================
-        # ELIGIBLE RESULT
-        # ========================================================================
-        if is_eligible:
-            st.success("""
-            ## ✅ System Suitable for Your PPAP
-
-            Based on your responses, this PPAP AI Review System is appropriate for your use case.
-            """)
-
-            st.markdown("""
-            ### Next Steps:
-            1. Click "Proceed to PPAP Case Setup" below
-            2. Create a new PPAP case with part details
-            3. Upload required documents (FAIR, OQ, PQ)
-            4. Use AI-powered analysis for document review
-
-            ### System Capabilities:
-            - Automated PPAP checklist generation
-            - Dimensional analysis from FAIR documents
-            - Equipment qualification validation (OQ)
-            - Statistical process control analysis (PQ)
-            - Gap detection and recommendations
-            - Comprehensive report generation
-            """)
-
-            # Additional notes based on Q3
-            if st.session_state.survey_responses['q3_process_verified'] == 'No':
-                st.warning("""
-                **Note:** You indicated the process output is not fully verified. While you can proceed with
-                the PPAP documentation review, please ensure process verification is completed before final
-                PPAP approval. The system will flag any missing verification documentation.
-                """)
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            if st.button("🚀 Proceed to PPAP Case Setup", type="primary", use_container_width=True):
+                # In integrated version, this would navigate to CASE_SETUP page
+                st.success("✅ Survey completed! Ready to create PPAP case.")
+                st.info("**Integration Note:** This would navigate to the PPAP Case Setup page in the integrated application.")
 
             st.markdown("---")
 
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if st.button("🚀 Proceed to PPAP Case Setup", type="primary", use_container_width=True):
-                    # In integrated version, this would navigate to CASE_SETUP page
-                    st.success("✅ Survey completed! Ready to create PPAP case.")
-                    st.info("**Integration Note:** This would navigate to the PPAP Case Setup page in the integrated application.")
-
-                st.markdown("---")
+            st.button("🔄 Restart Survey", use_container_width=True, on_click=reset_survey)
 
-                if st.button("🔄 Restart Survey", use_container_width=True):
-                    reset_survey()
-                    st.rerun()
+    # ========================================================================
+    # INELIGIBLE RESULT
+    # ========================================================================
+    else:
+        st.error(INELIGIBLE_MD)
 
-        # ========================================================================
-        # INELIGIBLE RESULT
-        # ========================================================================
-        else:
-            st.error("""
-            ## ⚠️ System Not Suitable for This PPAP
+        st.markdown("### Reasons for Incompatibility:")
 
-            Based on your responses, this PPAP AI Review System may not be appropriate for your use case.
-            """)
+        for i, reason in enumerate(st.session_state.survey_reasons, 1):
+            with st.container(border=True):
+                st.markdown(f"#### {i}. {reason['question']}")
+                st.markdown(f"**Your Response:** {reason['response']}")
+                st.markdown(f"**Explanation:** {reason['explanation']}")
 
-            st.markdown("### Reasons for Incompatibility:")
+        st.markdown("---")
 
-            reasons = get_ineligibility_reason()
+        st.markdown(RECOMMENDED_ACTIONS_MD)
 
-            for i, reason in enumerate(reasons, 1):
-                with st.container(border=True):
-                    st.markdown(f"#### {i}. {reason['question']}")
-                    st.markdown(f"**Your Response:** {reason['response']}")
-                    st.markdown(f"**Explanation:** {reason['explanation']}")
+        st.markdown("---")
 
-            st.markdown("---")
+        col1, col2 = st.columns(2)
 
-            st.markdown("""
-            ### Recommended Actions:
+        with col1:
+            st.button("🔄 Restart Survey", use_container_width=True, type="primary", on_click=reset_survey)
 
-            **For Non-Molding or Non-Surgical Unit PPAPs:**
-            - Contact your business unit's PPAP coordinator for appropriate review processes
-            - Different processes may have specialized requirements not covered by this system
+        with col2:
+            if st.button("📧 Contact Support (Demo)", use_container_width=True):
+                st.info("In production, this would open a support ticket or contact form.")
+
+# Page renderer per survey_page value
+SURVEY_PAGES = {
+    "WELCOME": render_welcome,
+    "Q1": render_q1,
+    "Q2": render_q2,
+    "Q3": render_q3,
+    "Q4": render_q4,
+    "RESULT": render_result,
+}
 
-            **For Legacy Product Parts:**
-            - Check for existing PPAP tickets for the product
-            - Coordinate with Quality Engineering to determine if documentation should be combined with previous approvals
-            - Legacy product PPAPs may require a different workflow (to be added in future system updates)
+# Initialize state
+init_survey_state()
 
-            **For Fixed Setpoint Processes:**
-            - Work with Process Engineering to establish acceptable parameter ranges
-            - Complete process capability studies to determine appropriate tolerances
-            - Ensure process robustness before proceeding with PPAP
-            - Parameter ranges are essential for FDA compliance and manufacturing reliability
+# ============================================================================
+# MAIN CONTENT AREA
+# ============================================================================
 
-            ### Need Help?
-            If you believe your PPAP should be eligible or have questions about these requirements,
-            please contact the PPAP Support Team or your Quality Engineering representative.
-            """)
+# Center the content
+left_space, center_col, right_space = st.columns([1, 3, 1])
 
-            st.markdown("---")
+with center_col:
+    # Header section
+    st.title("PPAP Eligibility Survey")
+    st.markdown("### Medtronic PPAP Document Review System")
 
-            col1, col2 = st.columns(2)
+    with st.container(border=True):
+        logo = load_logo()
+        if logo:
+            st.image(logo, width=120)
+        st.html(INTERNAL_BADGE_HTML)
 
-            with col1:
-                if st.button("🔄 Restart Survey", use_container_width=True, type="primary"):
-                    reset_survey()
-                    st.rerun()
+    st.markdown("---")
 
-            with col2:
-                if st.button("📧 Contact Support (Demo)", use_container_width=True):
-                    st.info("In production, this would open a support ticket or contact form.")
+    # Active survey page
+    SURVEY_PAGES[st.session_state.survey_page]()
 
 # ============================================================================
 # FOOTER